@@ -3,8 +3,141 @@
 # Sie ist verantwortlich für das Verwalten des DataFrames, die Undo/Redo-Funktionalität
 # und die Anwendung von Filtern und Sortierungen.
 
+import bisect
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
+try:
+    # Optional: SIMD-beschleunigte Teilstring-Suche für den Filter.
+    import stringzilla as sz
+except ImportError:
+    sz = None
+
+try:
+    # Optional: Die Arrow-Kernels geben die GIL frei, dadurch können Spalten parallel durchsucht werden.
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+try:
+    # Optional: JIT-kompilierter Zahlenparser für die numerische Sortierung von Textspalten.
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Trennzeichen zwischen den Zellen im zusammenhängenden Suchtext einer Spalte.
+_CELL_SEPARATOR = "\x00"
+
+def _match_substring(array, search_term: str) -> np.ndarray:
+    """Teilstring-Suche in einem Arrow-Array; gibt eine boolesche NumPy-Maske zurück (leere Zellen: False)."""
+    return pc.match_substring(array, search_term).fill_null(False).to_numpy(zero_copy_only=False)
+
+if njit is not None:
+    @njit(cache=True)
+    def _parse_float(data, start, end):
+        """Parst eine Dezimalzahl aus den UTF-8-Bytes data[start:end]; gibt NaN zurück, wenn das nicht gelingt."""
+        # Leerraum am Anfang und Ende überspringen
+        while start < end and (data[start] == 32 or 9 <= data[start] <= 13):
+            start += 1
+        while end > start and (data[end - 1] == 32 or 9 <= data[end - 1] <= 13):
+            end -= 1
+        if start == end:
+            return np.nan
+
+        sign = 1.0
+        if data[start] == 43 or data[start] == 45:  # '+' oder '-'
+            if data[start] == 45:
+                sign = -1.0
+            start += 1
+
+        mantissa = 0.0
+        digits = 0
+        exponent = 0
+        while start < end and 48 <= data[start] <= 57:
+            mantissa = mantissa * 10.0 + (data[start] - 48)
+            digits += 1
+            start += 1
+        if start < end and data[start] == 46:  # '.'
+            start += 1
+            while start < end and 48 <= data[start] <= 57:
+                mantissa = mantissa * 10.0 + (data[start] - 48)
+                digits += 1
+                exponent -= 1
+                start += 1
+        if digits == 0:
+            return np.nan
+
+        if start < end and (data[start] == 101 or data[start] == 69):  # 'e' oder 'E'
+            start += 1
+            exp_sign = 1
+            if start < end and (data[start] == 43 or data[start] == 45):
+                if data[start] == 45:
+                    exp_sign = -1
+                start += 1
+            exp_digits = 0
+            exp_value = 0
+            while start < end and 48 <= data[start] <= 57:
+                exp_value = exp_value * 10 + (data[start] - 48)
+                exp_digits += 1
+                start += 1
+            if exp_digits == 0:
+                return np.nan
+            exponent += exp_sign * exp_value
+
+        if start != end:
+            return np.nan
+        # Division durch eine exakte Zehnerpotenz ist genauer als Multiplikation mit 10**-n.
+        if exponent < 0:
+            return sign * mantissa / 10.0 ** (-exponent)
+        return sign * mantissa * 10.0 ** exponent
+
+    @njit(cache=True, parallel=True)
+    def _parse_floats(data, offsets, out):
+        """Parst alle Strings eines Arrow-String-Puffers (Daten + Offsets) parallel nach `out`."""
+        for i in prange(out.shape[0]):
+            out[i] = _parse_float(data, offsets[i], offsets[i + 1])
+else:
+    _parse_floats = None
+
+def _coerce_numeric(series: pd.Series) -> np.ndarray:
+    """
+    Wandelt eine Spalte in ein float64-Array um; ungültige Werte werden zu `NaN`.
+    Mit numba und pyarrow werden die Strings direkt aus dem zusammenhängenden Arrow-Puffer geparst,
+    ohne für jede Zelle ein Python-Objekt zu erzeugen.
+    """
+    if _parse_floats is None or pa is None:
+        # `errors='coerce'` verwandelt ungültige Werte in `NaN`.
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+    try:
+        array = pa.array(series)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Gemischte Spalten (z.B. Zahlen und Text) werden zuerst in Strings umgewandelt.
+        array = pa.array(series.astype(str))
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    # Der Parser erwartet 64-Bit-Offsets; Arrow-Spalten vom Typ `string` haben nur 32-Bit-Offsets.
+    if array.type != pa.large_string():
+        array = pc.cast(array, pa.large_string())
+
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, dtype=np.uint8)
+    out = np.empty(len(array), dtype=np.float64)
+    _parse_floats(data, offsets, out)
+    return out
+
+def _same_value(a, b) -> bool:
+    """Vergleicht zwei Zellwerte; zwei fehlende Werte (NaN/None/NA) gelten als gleich."""
+    a_missing, b_missing = pd.isna(a), pd.isna(b)
+    if a_missing or b_missing:
+        return bool(a_missing and b_missing)
+    return type(a) is type(b) and a == b
+
 class AppLogic:
     """
     Verwaltet den Zustand und die Logik der Inventardaten.
@@ -16,10 +149,12 @@ class AppLogic:
         # Ein DataFrame, das die aktuell angezeigte, potenziell gefilterte und sortierte Ansicht darstellt.
         self._current_view_df = pd.DataFrame()
 
-        # Stacks für die Undo/Redo-Funktionalität. Speichert den Zustand des df als JSON.
+        # Stacks für die Undo/Redo-Funktionalität. Speichern Änderungsoperationen (Deltas)
+        # statt kompletter Kopien des df, damit die Kosten mit der Änderung und nicht mit
+        # der Blattgröße wachsen.
         self.undo_stack = []
         self.redo_stack = []
-        self.max_undo_steps = 50  # Begrenzt die Anzahl der speicherbaren Undo-Schritte.
+        self.max_undo_steps = 50  # Begrenzt die Anzahl der speicherbaren Undo-Operationen.
 
         # Aktiver Zustand für Filter und Sortierung
         self._active_filter_col = None
@@ -27,137 +162,577 @@ class AppLogic:
         self._active_sort_col = None
         self._active_sort_type = None
 
+        # Versionszähler des df, wird bei jeder Änderung erhöht. Dient als Schlüssel für Caches.
+        self._df_version = 0
+        # Version des df beim Laden bzw. letzten Speichern.
+        self._saved_version = 0
+        # Schlüssel (Kriterien + Version), mit dem _current_view_df zuletzt berechnet wurde.
+        self._view_cache_key = None
+        # Zeilenpositionen der Ansicht im df und der Ansichts-Schlüssel, für den sie gelten.
+        self._view_positions = None
+        self._positions_key = None
+        # Zuletzt berechnete Filtermaske und ihr Schlüssel (Filterspalte, Suchtext, Version).
+        self._filter_mask = None
+        self._mask_cache_key = None
+        # Spaltenbezogene Caches, nach Spaltenname. Bei einer Änderung wird nur die betroffene Spalte verworfen.
+        # Kleingeschriebene String-Fassung je Spalte für Filter und Textsortierung.
+        self._lower_cache = {}
+        # Zusammenhängender Suchtext (StringZilla) und Wertgrenzen je Spalte.
+        self._haystack_cache = {}
+        # Letzter Suchtext und Treffermaske je Spalte für die inkrementelle Suche beim Tippen.
+        self._prefix_cache = {}
+        # Numerische Fassung (float64, ungültige Werte als NaN) je Spalte für die numerische Sortierung.
+        self._numeric_cache = {}
+        # Zu durchsuchende Werte als Arrow-Array für die parallele Suche.
+        self._arrow_cache = {}
+        # Hash-Index der verschiedenen Werte je Spalte: (Werte, Zeilen-Codes oder None).
+        self._value_index = {}
+
+        # Spezialisierte Sortierfunktionen je (Sortierspalte, Sortiertyp, Datentyp).
+        self._specialized = {}
+
+        # Thread-Pool für die parallele Suche über alle Spalten, wird beim ersten Bedarf erstellt.
+        self._scan_pool = None
+
     def load_new_sheet(self, dataframe: pd.DataFrame):
         """
         Lädt Daten für ein neues Tabellenblatt und setzt den Zustand zurück.
+        Das DataFrame wird ohne Kopie übernommen und danach von AppLogic verändert;
+        der Aufrufer darf es anschließend nicht mehr selbst verwenden.
 
         Args:
             dataframe (pd.DataFrame): Das neue DataFrame, das geladen werden soll.
         """
-        self.df = dataframe.copy(deep=True)
+        self.df = dataframe
         self.undo_stack = []
         self.redo_stack = []
+        self._mark_changed()
+        self._saved_version = self._df_version
         self._active_filter_col = None
         self._active_filter_text = ""
         self._active_sort_col = None
         self._active_sort_type = None
-        
-        self.push_state() # Speichert den initialen Zustand für Undo.
+
         self.apply_filters_and_sort()
 
+    def get_filter_state(self) -> tuple:
+        """Gibt die aktiven Kriterien als (Filterspalte, Filtertext, Sortierspalte, Sortiertyp) zurück."""
+        return (self._active_filter_col, self._active_filter_text,
+                self._active_sort_col, self._active_sort_type)
+
     def get_current_view(self) -> pd.DataFrame:
-        """Gibt die aktuell gefilterte und sortierte Ansicht der Daten zurück."""
+        """
+        Gibt die aktuell gefilterte und sortierte Ansicht der Daten zurück.
+        Sie wird nur neu berechnet, wenn sich Kriterien oder Daten seit der letzten Berechnung
+        geändert haben; wiederholte Aufrufe geben sonst dasselbe DataFrame zurück.
+        """
+        self.apply_filters_and_sort()
         return self._current_view_df
 
-    def push_state(self):
+    def affects_view(self, col: int) -> bool:
         """
-        Speichert den aktuellen Zustand des DataFrames im Undo-Stack.
+        Gibt zurück, ob Änderungen in der Spalte die Zeilen der Ansicht verschieben können,
+        weil nach ihr gefiltert oder sortiert wird.
+        """
+        name = self.df.columns[col]
+        if self._active_sort_col == name:
+            return True
+        return bool(self._active_filter_text.strip()) and (self._active_filter_col == name
+                                                           or self._active_filter_col not in self.df.columns)
+
+    def get_version(self) -> int:
+        """Gibt den Versionszähler des df zurück; er ändert sich bei jedem Laden und jeder Änderung."""
+        return self._df_version
+
+    def has_unsaved_changes(self) -> bool:
+        """Gibt zurück, ob das df seit dem Laden oder letzten Speichern geändert wurde."""
+        return self._df_version != self._saved_version
+
+    def mark_saved(self):
+        """Markiert den aktuellen Zustand des df als gespeichert."""
+        self._saved_version = self._df_version
+
+    def record_edit(self, row: int, col: int, old_value, new_value):
+        """
+        Speichert eine Zelländerung im Undo-Stack. Muss vor der Änderung des df aufgerufen werden.
         Löscht den Redo-Stack, da eine neue Änderung vorgenommen wurde.
+
+        Args:
+            row (int): Die Zeilenposition im Haupt-DataFrame.
+            col (int): Die Spaltenposition im Haupt-DataFrame.
+            old_value: Der Wert vor der Änderung.
+            new_value: Der Wert nach der Änderung.
+        """
+        self._mark_changed(col)
+        self._push_op(('set', row, col, old_value, new_value))
+
+    def set_cell(self, row: int, col: int, value):
+        """
+        Ändert eine Zelle im Haupt-DataFrame und zeichnet die Änderung für Undo auf.
+
+        Args:
+            row (int): Die Zeilenposition im Haupt-DataFrame.
+            col (int): Die Spaltenposition im Haupt-DataFrame.
+            value: Der neue Wert.
+        """
+        old_value = self.df.iat[row, col]
+        if _same_value(old_value, value):
+            return  # Keine tatsächliche Änderung, also auch kein neuer Undo-Schritt.
+        self.record_edit(row, col, old_value, value)
+        self._write_cell(row, col, value)
+
+    def clear_cells(self, rows, cols):
+        """
+        Leert mehrere Zellen (z.B. eine Markierung) und zeichnet das als einen Undo-Schritt auf.
+        Der Schritt speichert je Spalte die Zeilenpositionen und alten Werte als Arrays,
+        damit Undo/Redo jede Spalte mit einer einzigen Zuweisung zurückschreibt.
+
+        Args:
+            rows: Die Zeilenpositionen der Zellen im Haupt-DataFrame.
+            cols: Die Spaltenpositionen der Zellen, in derselben Reihenfolge wie `rows`.
+
+        Returns:
+            Die geänderten Zellen der Ansicht wie bei `undo`, oder eine leere Liste,
+            wenn alle Zellen bereits leer waren.
         """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        changes = []
+        for col in np.unique(cols).tolist():
+            col_rows = np.unique(rows[cols == col])
+            old_values = self.df.iloc[col_rows, col].to_numpy(dtype=object)
+            # Bereits leere Zellen werden nicht aufgezeichnet.
+            filled = ~pd.isna(old_values)
+            if not filled.any():
+                continue
+            new_values = np.full(int(filled.sum()), None, dtype=object)
+            changes.append((col, col_rows[filled], old_values[filled], new_values))
+        if not changes:
+            return []
+
+        op = ('cells', tuple(changes))
+        self._push_op(op)
+        self._apply_op(op, undo=False)
+        self.apply_filters_and_sort()
+        return self._changed_view_cells(op)
+
+    def _mark_changed(self, col: int = None):
+        """
+        Erhöht die Version des df und verwirft die Caches der geänderten Spalte.
+        Ohne Spaltenangabe (z.B. beim Laden eines neuen Blatts) werden alle Caches verworfen.
+        """
+        self._df_version += 1
+        if col is None:
+            self._lower_cache = {}
+            self._haystack_cache = {}
+            self._prefix_cache = {}
+            self._numeric_cache = {}
+            self._arrow_cache = {}
+            self._value_index = {}
+            self._specialized = {}
+            return
+
+        name = self.df.columns[col]
+        for cache in (self._lower_cache, self._haystack_cache, self._prefix_cache,
+                      self._numeric_cache, self._arrow_cache, self._value_index):
+            cache.pop(name, None)
+
+    def _push_op(self, op):
+        """Legt eine Operation auf den Undo-Stack und begrenzt dessen Größe."""
+        self.redo_stack = []  # Eine neue Aktion löscht den Redo-Stack.
+
+        self.undo_stack.append(op)
+        # Begrenzt die Größe des Undo-Stacks, um Speicher zu sparen.
+        if len(self.undo_stack) > self.max_undo_steps:
+            self.undo_stack.pop(0)
+
+    def _write_cell(self, row: int, col: int, value):
+        """Schreibt einen Wert in das Haupt-DataFrame, notfalls nach Umwandlung der Spalte in `object`."""
+        try:
+            self.df.iat[row, col] = value
+        except (TypeError, ValueError):
+            # Die Spalte kann den Wert nicht aufnehmen (z.B. Text in einer Zahlenspalte).
+            self.df.isetitem(col, self.df.iloc[:, col].astype(object))
+            self.df.iat[row, col] = value
+
+    def _write_cells(self, rows: np.ndarray, col: int, values: np.ndarray):
+        """Schreibt mehrere Werte einer Spalte in einem Schritt, notfalls nach Umwandlung der Spalte in `object`."""
+        column = self.df.iloc[:, col]
+        # Ein `object`-Array passt nicht in typisierte Spalten (Zahl, Datum, Arrow-String), daher wird es
+        # zuerst in den Datentyp der Spalte umgewandelt. Ist das nicht möglich oder gingen dabei leere
+        # Werte verloren (z.B. leer in einer Ganzzahl- oder Wahrheitswertspalte), wird die Spalte zu `object`.
         try:
-            # Serialisiert das DataFrame in einen JSON-String für den Vergleich und die Speicherung.
-            # `orient='split'` ist effizient und bewahrt dtypes gut.
-            current_df_json = self.df.to_json(orient='split', date_format='iso')
-
-            # Nur pushen, wenn sich der Zustand tatsächlich geändert hat.
-            if not self.undo_stack or self.undo_stack[-1] != current_df_json:
-                self.undo_stack.append(current_df_json)
-                self.redo_stack = []  # Eine neue Aktion löscht den Redo-Stack.
-                
-                # Begrenzt die Größe des Undo-Stacks, um Speicher zu sparen.
-                if len(self.undo_stack) > self.max_undo_steps:
-                    self.undo_stack.pop(0)
-        except Exception as e:
-            print(f"Fehler beim Speichern des Undo-Zustands: {e}")
-
-    def undo(self) -> bool:
+            typed = pd.array(values, dtype=column.dtype)
+        except (TypeError, ValueError):
+            typed = None
+        if typed is None or not np.array_equal(pd.isna(typed), pd.isna(values)):
+            self.df.isetitem(col, column.astype(object))
+            typed = values
+        self.df.iloc[rows, col] = typed
+
+    def _apply_op(self, op, undo: bool):
+        """Spielt eine Operation rückwärts (Undo) oder vorwärts (Redo) ab."""
+        if op[0] == 'set':
+            _, row, col, old_value, new_value = op
+            self._mark_changed(col)
+            self._write_cell(row, col, old_value if undo else new_value)
+            return
+        # ('cells', ((Spalte, Zeilen, alte Werte, neue Werte), ...)): eine Zuweisung je Spalte.
+        for col, rows, old_values, new_values in op[1]:
+            self._mark_changed(col)
+            self._write_cells(rows, col, old_values if undo else new_values)
+
+    def undo(self):
         """
         Macht die letzte Aktion rückgängig.
-        Gibt True zurück, wenn erfolgreich, sonst False.
+        Gibt die geänderten Zellen als Liste von (Zeile, Spalte) der aktuellen Ansicht zurück,
+        oder None, wenn nichts rückgängig zu machen war oder sich die Zeilen der Ansicht
+        (Filter/Sortierung) geändert haben und sie komplett neu angezeigt werden muss.
         """
-        if len(self.undo_stack) > 1:
-            # Bewegt den aktuellen Zustand zum Redo-Stack
-            current_state = self.undo_stack.pop()
-            self.redo_stack.append(current_state)
+        if not self.undo_stack:
+            return None
 
-            # Lädt den vorherigen Zustand
-            previous_state_json = self.undo_stack[-1]
-            self.df = pd.read_json(previous_state_json, orient='split')
-            self.apply_filters_and_sort()
-            return True
-        return False
+        op = self.undo_stack.pop()
+        self._apply_op(op, undo=True)
+        self.redo_stack.append(op)
+        self.apply_filters_and_sort()
+        return self._changed_view_cells(op)
 
-    def redo(self) -> bool:
+    def redo(self):
         """
         Stellt die zuletzt rückgängig gemachte Aktion wieder her.
-        Gibt True zurück, wenn erfolgreich, sonst False.
+        Rückgabe wie bei `undo`.
         """
-        if self.redo_stack:
-            # Nimmt den Zustand vom Redo-Stack und macht ihn zum aktuellen Zustand
-            state_to_restore = self.redo_stack.pop()
-            self.undo_stack.append(state_to_restore)
+        if not self.redo_stack:
+            return None
 
-            self.df = pd.read_json(state_to_restore, orient='split')
-            self.apply_filters_and_sort()
-            return True
-        return False
+        op = self.redo_stack.pop()
+        self._apply_op(op, undo=False)
+        self.undo_stack.append(op)
+        self.apply_filters_and_sort()
+        return self._changed_view_cells(op)
+
+    def _changed_view_cells(self, op):
+        """
+        Bildet die Zellen einer Operation auf die aktuelle Ansicht ab.
+        Gibt None zurück, wenn eine geänderte Spalte gefiltert oder sortiert wird, da sich
+        dann die Zeilen der Ansicht selbst verschoben haben können.
+        """
+        if op[0] == 'set':
+            _, row, col, _, _ = op
+            columns = [(col, np.array([row]))]
+        else:
+            columns = [(col, rows) for col, rows, _, _ in op[1]]
+        if any(self.affects_view(col) for col, _ in columns):
+            return None
+
+        positions = self._get_view_positions()
+        cells = []
+        for col, rows in columns:
+            # Ist eine Zeile in der Ansicht ausgeblendet, gibt es dort keine sichtbare Änderung.
+            view_rows = rows if positions is None else np.flatnonzero(np.isin(positions, rows))
+            cells.extend((int(view_row), col) for view_row in view_rows)
+        return cells
 
     def apply_filters_and_sort(self, filter_col=None, filter_text=None, sort_col=None, sort_type=None):
         """
         Wendet die übergebenen oder die gespeicherten Filter- und Sortierkriterien an.
+        Haben sich weder Kriterien noch Daten geändert, bleibt die zuletzt berechnete Ansicht bestehen.
         """
         # Aktualisiert die internen Kriterien, wenn neue übergeben werden.
         if filter_col is not None: self._active_filter_col = filter_col
         if filter_text is not None: self._active_filter_text = filter_text
         if sort_col is not None: self._active_sort_col = sort_col
         if sort_type is not None: self._active_sort_type = sort_type
+
+        cache_key = (self._active_filter_col, self._active_filter_text,
+                     self._active_sort_col, self._active_sort_type, self._df_version)
+        if cache_key == self._view_cache_key:
+            return
+
+        # Weder Filter noch Sortierung aktiv (Standard nach dem Laden): Die Ansicht ist das df selbst.
+        if not self._active_filter_text and not self._active_sort_col:
+            self._current_view_df = self.df
+            self._view_cache_key = cache_key
+            return
         
         if self.df.empty:
             self._current_view_df = pd.DataFrame(columns=self.df.columns)
+            self._view_cache_key = cache_key
             return
 
-        temp_df = self.df.copy()
+        # Filtern und Sortieren erzeugen jeweils ein neues DataFrame, self.df wird nur gelesen.
+        temp_df = self.df
 
         # 1. Filter anwenden
-        if self._active_filter_text:
-            search_term = self._active_filter_text.strip().lower()
-            if search_term:
-                # Filtern auf eine bestimmte Spalte oder alle Spalten
-                if self._active_filter_col and self._active_filter_col in temp_df.columns:
-                    # Stellt sicher, dass die Spalte für den Vergleich als String behandelt wird.
-                    temp_df = temp_df[temp_df[self._active_filter_col].astype(str).str.lower().str.contains(search_term, na=False)]
-                else:
-                    # Sucht in allen Spalten
-                    temp_df = temp_df[
-                        temp_df.apply(lambda row: row.astype(str).str.lower().str.contains(search_term, na=False).any(), axis=1)
-                    ]
+        mask = self._get_filter_mask()
+        if mask is not None:
+            temp_df = temp_df[mask]
 
         # 2. Sortierung anwenden
-        if self._active_sort_col and self._active_sort_col in temp_df.columns:
-            column_to_sort = self._active_sort_col
-            
-            ascending = True
-            is_numeric_sort = False
-
-            if self._active_sort_type in ['za', 'num_desc']:
-                ascending = False
-            
-            if self._active_sort_type in ['num_asc', 'num_desc']:
-                is_numeric_sort = True
-
-            if is_numeric_sort:
-                # Konvertiert die Spalte für die Sortierung zu einem numerischen Typ.
-                # `errors='coerce'` verwandelt ungültige Werte in `NaN`.
-                temp_df[column_to_sort] = pd.to_numeric(temp_df[column_to_sort], errors='coerce')
-                # `na_position='last'` stellt sicher, dass leere Werte immer am Ende landen.
-                temp_df = temp_df.sort_values(by=column_to_sort, ascending=ascending, na_position='last')
-            else:
-                # Sortiert als Text, ignoriert Groß-/Kleinschreibung.
-                temp_df = temp_df.sort_values(by=column_to_sort, ascending=ascending, na_position='last', key=lambda col: col.astype(str).str.lower())
+        temp_df = self._get_sort_impl()(temp_df, mask)
         
         self._current_view_df = temp_df
+        self._view_cache_key = cache_key
+
+    def _get_sort_impl(self):
+        """
+        Gibt die für die aktuellen Sortierkriterien spezialisierte Sortierfunktion zurück.
+        Die Fallunterscheidungen nach Sortiertyp, Richtung und Datentyp werden nur beim ersten Aufruf
+        je Kombination ausgewertet; danach wird die zwischengespeicherte Funktion direkt aufgerufen.
+        Die Funktion erhält das gefilterte DataFrame und die Filtermaske (oder None).
+        """
+        column_to_sort = self._active_sort_col
+        if not column_to_sort or column_to_sort not in self.df.columns:
+            return lambda temp_df, mask: temp_df
+
+        dtype = self.df[column_to_sort].dtype
+        key = (column_to_sort, self._active_sort_type, dtype)
+        impl = self._specialized.get(key)
+        if impl is None:
+            impl = self._build_sort_impl(column_to_sort, self._active_sort_type, dtype)
+            self._specialized[key] = impl
+        return impl
+
+    def _build_sort_impl(self, column_to_sort: str, sort_type: str, dtype):
+        """Erzeugt die Sortierfunktion für eine Kombination aus Spalte, Sortiertyp und Datentyp."""
+        ascending = sort_type not in ['za', 'num_desc']
+
+        if sort_type in ['num_asc', 'num_desc']:
+            if dtype == np.float64:
+                # float64-Spalten werden ohne Umwandlung direkt als Schlüssel verwendet.
+                get_keys = lambda: self.df[column_to_sort].to_numpy()
+            else:
+                get_keys = lambda: self._numeric_column(column_to_sort)
+
+            def sort_numeric(temp_df, mask):
+                # Sortiert nach dem numerischen Wert, ohne die angezeigten Daten zu verändern.
+                # Nur die Zeilen, die den Filter passieren, werden sortiert.
+                keys = get_keys()
+                positions = np.flatnonzero(mask) if mask is not None else np.arange(len(self.df))
+                subset = keys[positions]
+                # Negieren statt Umkehren hält die Sortierung stabil; `NaN` landet dabei immer am Ende.
+                order = np.argsort(subset if ascending else -subset, kind='stable')
+                return self.df.iloc[positions[order]]
+            return sort_numeric
+
+        def sort_text(temp_df, mask):
+            # Sortiert als Text, ignoriert Groß-/Kleinschreibung.
+            # Die kleingeschriebene Spalte kommt aus dem Cache; nur die gefilterten Zeilen werden sortiert.
+            keys = self._lowered_column(column_to_sort).to_numpy()
+            positions = np.flatnonzero(mask) if mask is not None else np.arange(len(self.df))
+            # Leere Zellen kommen wie bei `sort_values` in beiden Richtungen ans Ende.
+            missing = self.df[column_to_sort].isna().to_numpy()[positions]
+            blanks = positions[missing]
+            positions = positions[~missing]
+            subset = keys[positions]
+            if ascending:
+                order = np.argsort(subset, kind='stable')
+            else:
+                # Absteigend stabil: aufsteigend auf der umgekehrten Folge sortieren und zurückrechnen,
+                # damit gleiche Werte ihre ursprüngliche Reihenfolge behalten.
+                order = len(subset) - 1 - np.argsort(subset[::-1], kind='stable')[::-1]
+            return self.df.iloc[np.concatenate((positions[order], blanks))]
+        return sort_text
+
+    def _get_filter_mask(self):
+        """
+        Gibt die boolesche Filtermaske (NumPy-Array) für das Haupt-DataFrame zurück oder None,
+        wenn kein Filter aktiv ist. Die Maske wird wiederverwendet, solange sich Filterkriterien
+        und Daten nicht ändern, z.B. wenn nur die Sortierung gewechselt wird.
+        """
+        if not self._active_filter_text:
+            return None
+        search_term = self._active_filter_text.strip().lower()
+        if not search_term:
+            return None
+
+        mask_key = (self._active_filter_col, search_term, self._df_version)
+        if mask_key == self._mask_cache_key:
+            return self._filter_mask
+
+        # Filtern auf eine bestimmte Spalte oder alle Spalten
+        if self._active_filter_col and self._active_filter_col in self.df.columns:
+            columns = [self._active_filter_col]
+        else:
+            columns = self.df.columns
+
+        # Spaltenweise vektorisierte Suche; die Masken der einzelnen Spalten werden ODER-verknüpft.
+        mask = np.zeros(len(self.df), dtype=bool)
+        for column_mask in self._scan_columns(columns, search_term):
+            mask |= column_mask
+
+        self._filter_mask = mask
+        self._mask_cache_key = mask_key
+        return self._filter_mask
+
+    def _scan_columns(self, columns, search_term: str) -> list:
+        """
+        Gibt je Spalte die Treffermaske von `_column_contains` zurück. Filter und Suche laufen
+        beide hierüber (Hash-Index, StringZilla, inkrementelle Suche).
+        """
+        if (pc is not None or sz is not None) and len(columns) > 1:
+            # Die Spalten werden parallel durchsucht; die Arrow- und StringZilla-Kernels geben dabei die GIL frei.
+            # Jeder Thread füllt nur die Caches seiner eigenen Spalte.
+            futures = [self._get_scan_pool().submit(self._column_contains, col, search_term) for col in columns]
+            return [future.result() for future in futures]
+        return [self._column_contains(col, search_term) for col in columns]
+
+    def find_in_view(self, search_term: str) -> list:
+        """
+        Sucht den kleingeschriebenen Text in allen Zellen der aktuellen Ansicht.
+        Gibt die Treffer zeilenweise geordnet als (Zeile, Spalte) der Ansicht zurück.
+        """
+        positions = self._get_view_positions()
+        hits = []
+        for col_pos, mask in enumerate(self._scan_columns(self.df.columns, search_term)):
+            if positions is not None:
+                mask = mask[positions]
+            rows = np.flatnonzero(mask).tolist()
+            hits.extend(zip(rows, [col_pos] * len(rows)))
+        hits.sort()
+        return hits
+
+    def _get_view_positions(self):
+        """Gibt die Zeilenpositionen der aktuellen Ansicht im df zurück, oder None, wenn die Ansicht das df selbst ist."""
+        view = self.get_current_view()
+        if view is self.df:
+            return None
+        if self._positions_key != self._view_cache_key:
+            self._view_positions = self.df.index.get_indexer(view.index)
+            self._positions_key = self._view_cache_key
+        return self._view_positions
+
+    def _lowered_column(self, col: str) -> pd.Series:
+        """
+        Gibt die Spalte als kleingeschriebene Strings zurück. Das Ergebnis wird zwischengespeichert,
+        bis sich die Spalte ändert, damit wiederholtes Filtern die Umwandlung nicht erneut ausführt.
+        """
+        lowered = self._lower_cache.get(col)
+        if lowered is None:
+            series = self.df[col]
+            if isinstance(series.dtype, pd.ArrowDtype) and pd.api.types.is_string_dtype(series.dtype):
+                # Arrow-Strings werden direkt im Arrow-Kernel kleingeschrieben; leere Zellen werden zu "".
+                lowered = series.str.lower().fillna("")
+            else:
+                # Leere Zellen werden wie bei Arrow-Strings und in der Anzeige zu "", nicht zu "nan".
+                lowered = series.astype(str).str.lower().where(series.notna(), "")
+            self._lower_cache[col] = lowered
+        return lowered
 
     def reset_filters_and_sort(self):
         """Setzt alle Filter- und Sortierkriterien zurück."""
         self.apply_filters_and_sort(filter_col="", filter_text="", sort_col="", sort_type="")
 
+    def _scan_values(self, col: str):
+        """
+        Gibt die zu durchsuchenden kleingeschriebenen Werte einer Spalte und deren Zuordnung zu den Zeilen zurück.
+        Wiederholen sich die Werte (z.B. Kategorien oder Mitarbeiter), wird über einen Hash-Index
+        (`pd.factorize`) jeder verschiedene Wert nur einmal durchsucht; `codes` ordnet jeder Zeile
+        ihren Wert zu. Sind die Werte überwiegend eindeutig, wird direkt zeilenweise gesucht und
+        `codes` ist None.
+        """
+        entry = self._value_index.get(col)
+        if entry is None:
+            lowered = self._lowered_column(col)
+            codes, uniques = pd.factorize(lowered)
+            if len(uniques) <= len(lowered) // 2:
+                entry = (pd.Series(uniques), codes)
+            else:
+                entry = (lowered, None)
+            self._value_index[col] = entry
+        return entry
+
+    def _expand_hits(self, col: str, hits: np.ndarray) -> np.ndarray:
+        """Überträgt die Treffer je verschiedenem Wert (siehe `_scan_values`) auf die Zeilen der Spalte."""
+        codes = self._value_index[col][1]
+        if codes is None:
+            return hits
+        expanded = hits[codes]
+        # `pd.factorize` gibt fehlenden Werten den Code -1; hits[-1] wäre der Treffer des letzten Werts.
+        expanded[codes == -1] = False
+        return expanded
+
+    def _arrow_scan_values(self, col: str):
+        """Gibt die zu durchsuchenden Werte als Arrow-Array zurück (zwischengespeichert, bis sich die Spalte ändert)."""
+        array = self._arrow_cache.get(col)
+        if array is None:
+            array = pa.array(self._scan_values(col)[0], type=pa.string())
+            self._arrow_cache[col] = array
+        return array
+
+    def _get_scan_pool(self) -> ThreadPoolExecutor:
+        """Gibt den Thread-Pool für die Spaltensuche zurück; er bleibt für weitere Suchen bestehen."""
+        if self._scan_pool is None:
+            self._scan_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        return self._scan_pool
+
+    def _numeric_column(self, col: str) -> np.ndarray:
+        """
+        Gibt die Spalte als float64-Array zurück, ungültige Werte werden zu `NaN`.
+        Das Ergebnis wird zwischengespeichert, bis sich die Spalte ändert.
+        """
+        numeric = self._numeric_cache.get(col)
+        if numeric is None:
+            series = self.df[col]
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                numeric = series.to_numpy(dtype='float64', na_value=np.nan)
+            else:
+                numeric = _coerce_numeric(series)
+            self._numeric_cache[col] = numeric
+        return numeric
+
+    def _column_contains(self, col: str, search_term: str) -> np.ndarray:
+        """
+        Gibt eine boolesche Maske der Zeilen zurück, deren Zelle in `col` den (kleingeschriebenen)
+        Suchtext enthält. Verlängert der Benutzer den vorherigen Suchtext, werden nur die bisherigen
+        Treffer erneut geprüft.
+        """
+        lowered = self._lowered_column(col)
+
+        previous = self._prefix_cache.get(col)
+        if previous is not None and search_term.startswith(previous[0]):
+            candidates = np.flatnonzero(previous[1])
+            values = lowered.to_numpy()[candidates]
+            mask = np.zeros(len(lowered), dtype=bool)
+            mask[candidates] = [search_term in value for value in values]
+        else:
+            values, _ = self._scan_values(col)
+            if sz is not None and _CELL_SEPARATOR not in search_term:
+                hits = self._haystack_contains(col, values, search_term)
+            elif pc is not None:
+                hits = _match_substring(self._arrow_scan_values(col), search_term)
+            else:
+                # `regex=False` nutzt die schnelle Teilstring-Suche statt regulärer Ausdrücke.
+                hits = values.str.contains(search_term, na=False, regex=False).to_numpy(dtype=bool)
+            mask = self._expand_hits(col, hits)
+
+        self._prefix_cache[col] = (search_term, mask)
+        return mask
+
+    def _haystack_contains(self, col: str, values: pd.Series, search_term: str) -> np.ndarray:
+        """
+        Sucht mit StringZilla im zusammenhängenden UTF-8-Text der Werte und ordnet jeden Treffer
+        über die Zellgrenzen seinem Wert zu. Nach einem Treffer wird direkt zum nächsten Wert gesprungen.
+        """
+        cached = self._haystack_cache.get(col)
+        if cached is None:
+            # Fehlende Werte (z.B. NaN) werden wie leere Zellen behandelt.
+            encoded = [value.encode('utf-8') if isinstance(value, str) else b"" for value in values.tolist()]
+            # Startposition jeder Zelle im zusammenhängenden Text (inkl. Trennzeichen).
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1])).tolist()
+            haystack = sz.Str(_CELL_SEPARATOR.encode('utf-8').join(encoded))
+            cached = (haystack, starts)
+            self._haystack_cache[col] = cached
+        haystack, starts = cached
+
+        mask = np.zeros(len(values), dtype=bool)
+        position = haystack.find(search_term)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            mask[row] = True
+            if row + 1 >= len(starts):
+                break
+            position = haystack.find(search_term, starts[row + 1])
+        return mask
@@ -8,7 +8,11 @@ from PyQt6.QtWidgets import (
     QLineEdit, QMessageBox, QListWidget, QListWidgetItem, QCheckBox, QGroupBox, QSpacerItem,
     QSizePolicy
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QStringListModel
+
+# Erste Einträge der Spaltenauswahl im Filterdialog, die "keine bestimmte Spalte" bedeuten.
+ALLE_SPALTEN = "Alle Spalten"
+KEINE_SPALTE = "Keine"
 
 class ConfirmExitDialog(QDialog):
     """Ein einfacher Dialog, der den Benutzer fragt, ob er die Anwendung wirklich beenden möchte."""
@@ -37,7 +41,16 @@ class ConfirmExitDialog(QDialog):
 
 class FilterDialog(QDialog):
     """Dialog zum Anwenden von Filtern und Sortierungen auf die Tabelle."""
-    def __init__(self, column_names, parent=None):
+    # Wird ausgelöst, wenn der Benutzer eine Pause beim Tippen des Filtertexts macht (Live-Vorschau).
+    filter_changed = pyqtSignal()
+
+    def __init__(self, filter_column_model: QStringListModel, sort_column_model: QStringListModel, parent=None):
+        """
+        Args:
+            filter_column_model (QStringListModel): Spaltennamen mit `ALLE_SPALTEN` als erstem Eintrag.
+            sort_column_model (QStringListModel): Spaltennamen mit `KEINE_SPALTE` als erstem Eintrag.
+            parent: Das übergeordnete Widget.
+        """
         super().__init__(parent)
         self.setWindowTitle("Filter und Sortierung")
         
@@ -54,14 +67,21 @@ class FilterDialog(QDialog):
         filter_layout = QVBoxLayout()
         filter_layout.addWidget(QLabel("Spalte zum Filtern:"))
         self.filter_column_combo = QComboBox()
-        self.filter_column_combo.addItem("Alle Spalten", "")
-        self.filter_column_combo.addItems(column_names)
+        # Die Modelle gehören dem Hauptfenster und werden nur beim Blattwechsel neu befüllt.
+        self.filter_column_combo.setModel(filter_column_model)
         filter_layout.addWidget(self.filter_column_combo)
         
         filter_layout.addWidget(QLabel("Filtertext:"))
         self.filter_text_input = QLineEdit()
         self.filter_text_input.setPlaceholderText("Text eingeben...")
         filter_layout.addWidget(self.filter_text_input)
+
+        # Verzögert die Vorschau, damit der Filter erst nach einer Tipp-Pause angewendet wird.
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(150)
+        self._debounce.timeout.connect(self._emit_filter)
+        self.filter_text_input.textChanged.connect(lambda _: self._debounce.start())
         filter_group.setLayout(filter_layout)
         layout.addWidget(filter_group)
 
@@ -70,8 +90,7 @@ class FilterDialog(QDialog):
         sort_layout = QVBoxLayout()
         sort_layout.addWidget(QLabel("Spalte zum Sortieren:"))
         self.sort_column_combo = QComboBox()
-        self.sort_column_combo.addItem("Keine", "")
-        self.sort_column_combo.addItems(column_names)
+        self.sort_column_combo.setModel(sort_column_model)
         sort_layout.addWidget(self.sort_column_combo)
         
         sort_layout.addWidget(QLabel("Sortierreihenfolge:"))
@@ -100,14 +119,25 @@ class FilterDialog(QDialog):
 
     def apply_and_accept(self):
         """Liest die Werte aus den Widgets aus und schließt den Dialog."""
+        self._debounce.stop()
+        self._read_values()
+        self.accept()
+
+    def _emit_filter(self):
+        """Liest die aktuellen Werte aus und meldet sie für die Live-Vorschau."""
+        self._read_values()
+        self.filter_changed.emit()
+
+    def _read_values(self):
+        """Überträgt die Auswahl der Widgets in die Rückgabewerte des Dialogs."""
         self.filter_column_name = self.filter_column_combo.currentData() or self.filter_column_combo.currentText()
-        if self.filter_column_name == "Alle Spalten":
+        if self.filter_column_name == ALLE_SPALTEN:
             self.filter_column_name = ""
             
         self.filter_text = self.filter_text_input.text().strip()
         
         self.sort_column_name = self.sort_column_combo.currentData() or self.sort_column_combo.currentText()
-        if self.sort_column_name == "Keine":
+        if self.sort_column_name == KEINE_SPALTE:
             self.sort_column_name = ""
 
         sort_map = {
@@ -117,8 +147,6 @@ class FilterDialog(QDialog):
             "Numerisch absteigend (9-0)": 'num_desc'
         }
         self.sort_type = sort_map.get(self.sort_type_combo.currentText())
-        
-        self.accept()
 
 class RecentFilesDialog(QDialog):
     """Dialog zur Anzeige und Auswahl von zuletzt verwendeten Dateien."""
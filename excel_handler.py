@@ -2,27 +2,92 @@
 # Dieses Modul ist ausschließlich für Interaktionen mit Excel-Dateien zuständig.
 # Es kapselt die Logik zum Laden, Speichern und Überprüfen von Excel-Dateien.
 
+import errno
 import os
 import pandas as pd
 from openpyxl import load_workbook, Workbook
 import numpy as np
 
+# Plattformabhängige Module für die nicht-blockierende Sperrprüfung.
+try:
+    import msvcrt
+    fcntl = None
+except ImportError:
+    import fcntl
+    msvcrt = None
+
+try:
+    # Optional: Mit pyarrow werden die Spalten als Arrow-Puffer geladen, sodass
+    # String-Operationen in den vektorisierten Arrow-Kernels laufen.
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    # Optional: Der Rust-basierte calamine-Parser liest Tabellenblätter deutlich schneller als openpyxl.
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+try:
+    # Optional: xlsxwriter schreibt Blätter zeilenweise mit konstantem Speicherbedarf.
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+def _read_engine(file_path: str) -> str:
+    """
+    Wählt die Engine zum Lesen einer Excel-Datei. calamine wird bevorzugt, wenn es installiert ist;
+    makrofähige .xlsm-Dateien werden weiterhin mit openpyxl gelesen.
+    """
+    if python_calamine is not None and not file_path.lower().endswith('.xlsm'):
+        return 'calamine'
+    return 'openpyxl'
+
 def is_excel_file_locked(file_path: str) -> bool:
     """
-    Überprüft, ob eine Excel-Datei gesperrt ist, indem nach einer temporären
-    Lock-Datei von Excel gesucht wird (beginnt mit '~').
+    Überprüft, ob eine Excel-Datei gesperrt ist, indem versucht wird, sie ohne Warten
+    zum Schreiben zu öffnen und auf Betriebssystemebene zu sperren. Unter POSIX wird
+    zusätzlich nach der temporären Lock-Datei von Excel gesucht (beginnt mit '~$'),
+    da Office-Programme dort keine Dateisperren setzen.
 
     Args:
         file_path (str): Der Pfad zur Excel-Datei.
 
     Returns:
-        bool: True, wenn eine Lock-Datei existiert, sonst False.
+        bool: True, wenn die Datei gesperrt ist, sonst False.
     """
-    if not os.path.exists(file_path):
+    try:
+        f = open(file_path, 'rb+')
+    except FileNotFoundError:
         return False
-    
-    lock_file = os.path.join(os.path.dirname(file_path), "~$" + os.path.basename(file_path))
-    return os.path.exists(lock_file)
+    except PermissionError as e:
+        # Unter Windows liefert eine von Excel geöffnete Datei einen Freigabe- bzw. Sperrverstoß
+        # (winerror 32/33). Andere Zugriffsfehler (EACCES, z.B. schreibgeschützte Datei oder
+        # Netzfreigabe) bedeuten keine Sperre; die Datei kann weiterhin geladen werden.
+        if getattr(e, 'winerror', None) in (32, 33):
+            return True
+    except OSError as e:
+        # Auf einem schreibgeschützten Dateisystem (EROFS, z.B. Wechselmedium) scheitert schon das
+        # Öffnen zum Schreiben; die Datei ist dadurch nicht gesperrt.
+        if e.errno != errno.EROFS:
+            return True
+    else:
+        with f:
+            try:
+                if msvcrt is not None:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                return True
+
+    if msvcrt is None:
+        lock_file = os.path.join(os.path.dirname(file_path), "~$" + os.path.basename(file_path))
+        return os.path.exists(lock_file)
+    return False
 
 def get_sheet_names(file_path: str) -> list:
     """
@@ -46,6 +111,9 @@ def get_sheet_names(file_path: str) -> list:
         raise IOError(f"Die Excel-Datei '{os.path.basename(file_path)}' ist gesperrt. Bitte schließen Sie sie in Excel.")
 
     try:
+        if _read_engine(file_path) == 'calamine':
+            # Liest nur die Arbeitsmappen-Metadaten, ohne pandas einzubeziehen.
+            return python_calamine.CalamineWorkbook.from_path(file_path).sheet_names
         xls = pd.ExcelFile(file_path, engine='openpyxl')
         return xls.sheet_names
     except Exception as e:
@@ -75,19 +143,97 @@ def load_sheet(file_path: str, sheet_name: str) -> pd.DataFrame:
     if is_excel_file_locked(file_path):
         raise IOError(f"Die Excel-Datei '{os.path.basename(file_path)}' ist gesperrt. Bitte schließen Sie sie in Excel.")
 
+    return _read_sheet(file_path, sheet_name, _read_engine(file_path))
+
+
+def open_workbook(file_path: str):
+    """
+    Öffnet eine Excel-Datei einmalig als `pd.ExcelFile` zum Lesen (openpyxl im
+    `read_only`/`data_only`-Modus oder calamine). Die geöffnete Arbeitsmappe kann für
+    `get_workbook_sheet_names` und `load_sheet_from_wb` wiederverwendet werden, sodass
+    das Archiv nur einmal pro Datei entpackt und eingelesen wird.
+    Sie muss mit `close_workbook` geschlossen werden, bevor die Datei gespeichert wird.
+
+    Args:
+        file_path (str): Der Pfad zur Excel-Datei.
+
+    Returns:
+        pd.ExcelFile: Die geöffnete Arbeitsmappe.
+
+    Raises:
+        FileNotFoundError: Wenn die Datei nicht existiert.
+        IOError: Wenn die Datei gesperrt ist.
+        Exception: Bei anderen Ladefehlern.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Die Datei '{os.path.basename(file_path)}' wurde nicht gefunden.")
+    
+    if is_excel_file_locked(file_path):
+        raise IOError(f"Die Excel-Datei '{os.path.basename(file_path)}' ist gesperrt. Bitte schließen Sie sie in Excel.")
+
+    try:
+        return pd.ExcelFile(file_path, engine=_read_engine(file_path))
+    except Exception as e:
+        raise Exception(f"Fehler beim Öffnen von '{os.path.basename(file_path)}': {e}")
+
+
+def get_workbook_sheet_names(workbook: pd.ExcelFile) -> list:
+    """Gibt die Namen aller Tabellenblätter einer mit `open_workbook` geöffneten Arbeitsmappe zurück."""
+    return workbook.sheet_names
+
+
+def load_sheet_from_wb(workbook: pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+    """
+    Lädt ein einzelnes Tabellenblatt aus einer mit `open_workbook` geöffneten Arbeitsmappe.
+
+    Args:
+        workbook (pd.ExcelFile): Die geöffnete Arbeitsmappe.
+        sheet_name (str): Der Name des zu ladenden Tabellenblatts.
+
+    Returns:
+        pd.DataFrame: Das geladene DataFrame.
+
+    Raises:
+        ValueError: Wenn das Blatt nicht existiert.
+        Exception: Bei anderen Ladefehlern.
+    """
+    return _read_sheet(workbook, sheet_name, workbook.engine)
+
+
+def close_workbook(workbook: pd.ExcelFile):
+    """Schließt eine mit `open_workbook` geöffnete Arbeitsmappe und gibt die Datei frei."""
+    workbook.close()
+
+
+def _read_sheet(source, sheet_name: str, engine: str) -> pd.DataFrame:
+    """Liest ein Tabellenblatt aus einem Dateipfad oder einem geöffneten `pd.ExcelFile`."""
     try:
         # `header=0` verwendet die erste Zeile als Spaltenüberschriften.
-        df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', header=0)
+        df = pd.read_excel(source, sheet_name=sheet_name, engine=engine, header=0)
         # Stellt sicher, dass alle Spaltennamen Strings sind, um Fehler zu vermeiden.
         df.columns = df.columns.astype(str)
+        if pyarrow is not None:
+            _convert_text_columns_to_arrow(df)
         return df
     except ValueError as ve:
         # Dieser Fehler tritt oft auf, wenn das Blatt nicht existiert.
-        raise ValueError(f"Tabellenblatt '{sheet_name}' nicht in der Datei gefunden oder die Datei ist beschädigt.")
+        raise ValueError(f"Tabellenblatt '{sheet_name}' nicht in der Datei gefunden oder die Datei ist beschädigt. ({ve})")
     except Exception as e:
         raise Exception(f"Ein unerwarteter Fehler ist beim Laden von '{sheet_name}' aufgetreten: {e}")
 
 
+def _convert_text_columns_to_arrow(df: pd.DataFrame):
+    """
+    Legt reine Textspalten als Arrow-Strings ab, damit String-Operationen in den Arrow-Kernels laufen.
+    Spalten mit gemischten Werten (z.B. Zahlen und Text) bleiben unverändert, damit Zahlen beim
+    Speichern nicht als Text in die Arbeitsmappe zurückgeschrieben werden.
+    """
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) == 'string':
+            df.isetitem(position, column.astype(pd.ArrowDtype(pyarrow.string())))
+
+
 def save_sheet(file_path: str, sheet_name: str, df_to_save: pd.DataFrame):
     """
     Speichert ein DataFrame in einem bestimmten Tabellenblatt einer Excel-Datei.
@@ -106,6 +252,11 @@ def save_sheet(file_path: str, sheet_name: str, df_to_save: pd.DataFrame):
         raise IOError(f"Die Excel-Datei '{os.path.basename(file_path)}' ist gesperrt. Speichern nicht möglich.")
 
     try:
+        if _can_stream_sheet(file_path, sheet_name):
+            # Die Datei enthält nur dieses Blatt: Sie wird neu geschrieben, statt sie mit openpyxl zu laden.
+            _write_single_sheet(file_path, sheet_name, df_to_save)
+            return
+
         # pandas' ExcelWriter ermöglicht das Schreiben in bestehende Dateien.
         # `mode='a'` (append) und `if_sheet_exists='replace'` sind hier der Schlüssel.
         with pd.ExcelWriter(file_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
@@ -118,3 +269,42 @@ def save_sheet(file_path: str, sheet_name: str, df_to_save: pd.DataFrame):
             
     except Exception as e:
         raise Exception(f"Fehler beim Speichern der Daten in '{sheet_name}': {e}")
+
+
+def _can_stream_sheet(file_path: str, sheet_name: str) -> bool:
+    """
+    Prüft, ob das Blatt per Streaming geschrieben werden kann: xlsxwriter ist installiert, es handelt
+    sich um eine .xlsx-Datei und diese existiert noch nicht oder enthält ausschließlich dieses Blatt.
+    """
+    if xlsxwriter is None or not file_path.lower().endswith('.xlsx'):
+        return False
+    return not os.path.exists(file_path) or get_sheet_names(file_path) == [sheet_name]
+
+
+def _write_single_sheet(file_path: str, sheet_name: str, df_to_save: pd.DataFrame):
+    """
+    Schreibt ein DataFrame als einziges Blatt mit xlsxwriter im `constant_memory`-Modus.
+    Die Zeilen werden nacheinander auf die Festplatte geschrieben, sodass der Speicherbedarf nicht
+    mit der Blattgröße wächst. Geschrieben wird in eine temporäre Datei, die erst nach Erfolg die
+    Originaldatei ersetzt.
+    """
+    temp_path = file_path + ".tmp"
+    workbook = xlsxwriter.Workbook(temp_path, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        # Entspricht der Formatierung der Kopfzeile durch pandas' to_excel.
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, [str(col) for col in df_to_save.columns], header_format)
+
+        # `constant_memory` erfordert das Schreiben Zeile für Zeile; leere Zellen werden übersprungen.
+        for row_index, row in enumerate(df_to_save.to_numpy(dtype=object, na_value=None), start=1):
+            worksheet.write_row(row_index, 0, row)
+        workbook.close()
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
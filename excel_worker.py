@@ -0,0 +1,65 @@
+# excel_worker.py
+# Enthält Hintergrundaufgaben für das Laden und Speichern von Excel-Dateien.
+# Sie laufen im globalen QThreadPool, damit das Hauptfenster währenddessen nicht einfriert.
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+import excel_handler
+
+class ExcelWorkerSignals(QObject):
+    """Signale der Hintergrundaufgaben, da ein QRunnable selbst keine Signale senden kann."""
+    # Pfad, geöffnete Arbeitsmappe, Blattnamen, ausgewähltes Blatt und dessen DataFrame.
+    loaded = pyqtSignal(str, object, list, str, object)
+    # Pfad und Name des gespeicherten Blatts.
+    saved = pyqtSignal(str, str)
+    # Fehlermeldung.
+    failed = pyqtSignal(str)
+
+class ExcelLoader(QRunnable):
+    """
+    Öffnet eine Excel-Datei und lädt das erste (oder das gewünschte) Tabellenblatt.
+    Die geöffnete Arbeitsmappe wird mit dem Ergebnis übergeben, damit weitere Blätter daraus gelesen werden können.
+    """
+    def __init__(self, file_path: str, sheet_to_select: str = None):
+        super().__init__()
+        self.file_path = file_path
+        self.sheet_to_select = sheet_to_select
+        self.signals = ExcelWorkerSignals()
+
+    def run(self):
+        workbook = None
+        try:
+            workbook = excel_handler.open_workbook(self.file_path)
+            sheet_names = excel_handler.get_workbook_sheet_names(workbook)
+            if not sheet_names:
+                # Keine Blätter: Der Empfänger meldet das und schließt die Arbeitsmappe.
+                self.signals.loaded.emit(self.file_path, workbook, [], "", None)
+                return
+
+            # Wähle das erste Blatt aus, wenn keins angegeben ist oder das angegebene nicht existiert.
+            sheet_name = self.sheet_to_select if self.sheet_to_select in sheet_names else sheet_names[0]
+            df = excel_handler.load_sheet_from_wb(workbook, sheet_name)
+        except Exception as e:
+            if workbook is not None:
+                excel_handler.close_workbook(workbook)
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.loaded.emit(self.file_path, workbook, sheet_names, sheet_name, df)
+
+class ExcelSaver(QRunnable):
+    """Speichert ein DataFrame in ein Tabellenblatt einer Excel-Datei."""
+    def __init__(self, file_path: str, sheet_name: str, df):
+        super().__init__()
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.df = df
+        self.signals = ExcelWorkerSignals()
+
+    def run(self):
+        try:
+            excel_handler.save_sheet(self.file_path, self.sheet_name, self.df)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.saved.emit(self.file_path, self.sheet_name)
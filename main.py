@@ -9,12 +9,16 @@ from PyQt6.QtWidgets import QApplication
 # Die Zeile "from ui.main_window import MainWindow" wurde geändert,
 # da alle Python-Dateien im selben Verzeichnis liegen.
 from main_window import MainWindow
+import settings
 
 def run_app():
     """
     Initialisiert die QApplication und startet den Event-Loop.
     """
     app = QApplication(sys.argv)
+
+    # Legt fehlende Beispieldateien an, bevor das Hauptfenster sie lädt.
+    settings.ensure_assets()
     
     # Instanziiert das Hauptfenster aus der main_window.py Datei
     fenster = MainWindow()
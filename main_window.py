@@ -5,20 +5,30 @@
 
 import os
 import json
+from collections import OrderedDict
+import pandas as pd
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, 
-    QTableWidget, QTableWidgetItem, QMessageBox, QTabBar, QMenu, QFileDialog, 
+    QTableView, QAbstractItemView, QMessageBox, QTabBar, QMenu, QFileDialog, 
     QStatusBar, QHeaderView
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QIcon, QAction, QColor, QBrush
+from PyQt6.QtCore import Qt, QTimer, QStringListModel, QThreadPool
+from PyQt6.QtGui import QAction, QKeySequence
 
 # Importiere Logik und Helfer aus den neuen Modulen
 from app_logic import AppLogic
+from table_model import PandasTableModel
 import excel_handler
+from excel_worker import ExcelLoader, ExcelSaver
 from ui_helpers import kopiere_markierte_zellen
-from dialogs import ConfirmExitDialog, FilterDialog, RecentFilesDialog, SettingsDialog
-from settings import EXCEL_PFAD, LOGO_PFAD
+from dialogs import ConfirmExitDialog, FilterDialog, RecentFilesDialog, SettingsDialog, ALLE_SPALTEN, KEINE_SPALTE
+from settings import EXCEL_PFAD, get_logo_icon
+
+try:
+    # Optional: orjson serialisiert die Einstellungen deutlich schneller als das json-Modul.
+    import orjson
+except ImportError:
+    orjson = None
 
 class MainWindow(QMainWindow):
     """
@@ -32,13 +42,31 @@ class MainWindow(QMainWindow):
         
         # Speichert Pfade und Einstellungen
         self.settings = self._load_settings()
+        # Wird bei jeder Änderung der Einstellungen gesetzt; nur dann wird die Datei neu geschrieben.
+        self._settings_dirty = False
         self.excel_path = self.settings.get('last_excel_path', EXCEL_PFAD)
         self.sheet_names = []
         self.current_sheet = ""
+        # Die einmal geöffnete Arbeitsmappe, aus der alle Tabellenblätter gelesen werden.
+        self._wb = None
+        # Bereits eingelesene, unveränderte Tabellenblätter, Schlüssel (Änderungszeit der Datei, Blattname).
+        # Das angezeigte Blatt gehört der AppLogic und wird erst beim Wechsel wieder abgelegt.
+        self._sheet_cache = OrderedDict()
+        # Schlüssel des angezeigten Blatts; None, wenn es nicht (mehr) dem Stand der Datei entspricht.
+        self._shown_sheet_key = None
+        # Laufende Lade- oder Speicheraufgabe im Hintergrund; None, wenn keine läuft.
+        self._io_task = None
 
         # UI-bezogene Zustände
         self.search_hits = []
         self.current_hit_index = -1
+        # Zuletzt verwendete Suchbegriffe mit ihren Treffern (für schnelles Löschen/erneutes Tippen).
+        # Die kleingeschriebenen Spalten selbst hält die AppLogic je Spalte vor.
+        self._search_cache = OrderedDict()
+
+        # Spaltenlisten für den Filterdialog, werden nur beim Laden eines Blatts aktualisiert.
+        self._filter_column_model = QStringListModel([ALLE_SPALTEN], self)
+        self._sort_column_model = QStringListModel([KEINE_SPALTE], self)
         
         self.init_ui()
         self._post_init_load()
@@ -48,7 +76,7 @@ class MainWindow(QMainWindow):
         """Baut die Benutzeroberfläche auf."""
         self.setWindowTitle("Inventarverwaltung")
         self.setGeometry(100, 100, 1200, 800)
-        self.setWindowIcon(QIcon(LOGO_PFAD))
+        self.setWindowIcon(get_logo_icon())
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -67,8 +95,10 @@ class MainWindow(QMainWindow):
         self.tab_bar.tabCloseRequested.connect(self._handle_sheet_close)
         main_layout.addWidget(self.tab_bar)
 
-        # Die Haupttabelle
-        self.table = QTableWidget()
+        # Die Haupttabelle; die Zellen liefert das Modell direkt aus der AppLogic.
+        self.table = QTableView()
+        self.model = PandasTableModel(self.logic, self)
+        self.table.setModel(self.model)
         self._setup_table()
         main_layout.addWidget(self.table)
         
@@ -94,7 +124,12 @@ class MainWindow(QMainWindow):
         # Suchfeld
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("In Tabelle suchen...")
-        self.search_input.textChanged.connect(self._handle_search)
+        # Fasst schnelles Tippen zusammen: Gesucht wird erst 150 ms nach dem letzten Tastendruck.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(lambda: self._handle_search(self.search_input.text()))
+        self.search_input.textChanged.connect(lambda _: self._search_timer.start())
         layout.addWidget(self.search_input)
         
         # Undo/Redo Buttons
@@ -114,13 +149,22 @@ class MainWindow(QMainWindow):
         layout.addWidget(settings_button)
 
     def _setup_table(self):
-        """Konfiguriert die QTableWidget."""
-        self.table.setEditTriggers(QTableWidget.EditTrigger.DoubleClicked | QTableWidget.EditTrigger.AnyKeyPressed)
-        self.table.cellChanged.connect(self._handle_cell_changed)
+        """Konfiguriert die QTableView."""
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.AnyKeyPressed)
+        self.model.cell_edited.connect(self._handle_cell_changed)
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._show_table_context_menu)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectItems)
+        # Feste Standardbreite statt einer Messung aller Zellen; siehe _fit_column_widths.
+        self.table.horizontalHeader().setDefaultSectionSize(140)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
+
+        # Entf leert die markierten Zellen; auch im Kontextmenü verfügbar.
+        self._clear_cells_action = QAction("Inhalte löschen", self.table)
+        self._clear_cells_action.setShortcut(QKeySequence(QKeySequence.StandardKey.Delete))
+        self._clear_cells_action.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+        self._clear_cells_action.triggered.connect(self._handle_clear_cells)
+        self.table.addAction(self._clear_cells_action)
 
     def _post_init_load(self):
         """Lädt die initialen Daten, nachdem das UI-Setup abgeschlossen ist."""
@@ -138,88 +182,188 @@ class MainWindow(QMainWindow):
 
     def _load_excel_file(self, file_path: str, sheet_to_select: str = None):
         """
-        Lädt eine komplette Excel-Datei, aktualisiert das UI und die Logik.
+        Lädt eine komplette Excel-Datei im Hintergrund; UI und Logik werden in `_on_excel_loaded` aktualisiert.
         """
         self.show_status(f"Lade '{os.path.basename(file_path)}'...")
-        try:
-            self.sheet_names = excel_handler.get_sheet_names(file_path)
-            if not self.sheet_names:
-                self.show_error("Keine Tabellenblätter", f"Die Datei '{os.path.basename(file_path)}' enthält keine Tabellenblätter.")
-                return
+        # Die Datei wird nur einmal geöffnet; Blattnamen und Blätter kommen aus derselben Arbeitsmappe.
+        self._close_workbook()
+        self._sheet_cache.clear()
+        self._shown_sheet_key = None
+
+        loader = ExcelLoader(file_path, sheet_to_select)
+        loader.signals.loaded.connect(self._on_excel_loaded)
+        loader.signals.failed.connect(self._on_excel_load_failed)
+        self._start_io_task(loader)
+
+    def _on_excel_loaded(self, file_path: str, workbook, sheet_names: list, sheet_name: str, df):
+        """Übernimmt die im Hintergrund geöffnete Arbeitsmappe und zeigt das geladene Blatt an."""
+        self._finish_io_task()
+        if not sheet_names:
+            excel_handler.close_workbook(workbook)
+            self.show_error("Keine Tabellenblätter", f"Die Datei '{os.path.basename(file_path)}' enthält keine Tabellenblätter.")
+            return
 
-            self.excel_path = file_path
-            self._update_recent_files(file_path)
+        self._wb = workbook
+        self.sheet_names = sheet_names
+        self.excel_path = file_path
+        self._update_recent_files(file_path)
+        self.current_sheet = sheet_name
 
-            # Wähle das erste Blatt aus, wenn keins angegeben ist oder das angegebene nicht existiert.
-            self.current_sheet = sheet_to_select if sheet_to_select in self.sheet_names else self.sheet_names[0]
-            
-            self._load_current_sheet_data()
+        try:
+            self._show_sheet_data((os.path.getmtime(file_path), sheet_name), df)
             self._update_tab_bar()
             self.show_status(f"'{os.path.basename(file_path)}' geladen.", 3000)
-
-        except (FileNotFoundError, IOError, ValueError, Exception) as e:
+        except Exception as e:
             self.show_error("Fehler beim Laden der Excel-Datei", str(e))
             self.clear_all_data()
 
+    def _on_excel_load_failed(self, message: str):
+        """Meldet einen Fehler beim Laden im Hintergrund."""
+        self._finish_io_task()
+        self.show_error("Fehler beim Laden der Excel-Datei", message)
+        self.clear_all_data()
+
+    def _start_io_task(self, task):
+        """
+        Startet eine Lade- oder Speicheraufgabe im globalen Thread-Pool. Bis zu ihrem Ende sind
+        die Bedienelemente gesperrt, damit das DataFrame währenddessen nicht verändert wird.
+        """
+        self._io_task = task
+        self.centralWidget().setEnabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def _finish_io_task(self):
+        """Gibt die Bedienelemente nach dem Ende einer Hintergrundaufgabe wieder frei."""
+        self._io_task = None
+        self.centralWidget().setEnabled(True)
+
     def _load_current_sheet_data(self):
         """Lädt die Daten des aktuell ausgewählten Tabellenblatts."""
         if not self.current_sheet:
             return
         
         try:
-            df = excel_handler.load_sheet(self.excel_path, self.current_sheet)
-            self.logic.load_new_sheet(df)
-            self._update_table_view()
+            key = (os.path.getmtime(self.excel_path), self.current_sheet)
+            # Ein zwischengespeichertes Blatt wird aus dem Cache genommen und ohne Kopie an die AppLogic übergeben.
+            df = self._sheet_cache.pop(key, None)
+            if df is None:
+                if self._wb is None:
+                    self._wb = excel_handler.open_workbook(self.excel_path)
+                df = excel_handler.load_sheet_from_wb(self._wb, self.current_sheet)
+            self._show_sheet_data(key, df)
         except Exception as e:
             self.show_error(f"Fehler beim Laden von Blatt '{self.current_sheet}'", str(e))
             self.clear_all_data()
 
+    def _cache_sheet(self, key: tuple, df: pd.DataFrame):
+        """Legt ein eingelesenes Blatt im Zwischenspeicher ab, der auf 8 Blätter begrenzt ist."""
+        self._sheet_cache[key] = df
+        if len(self._sheet_cache) > 8:
+            self._sheet_cache.popitem(last=False)
+
+    def _show_sheet_data(self, key: tuple, df: pd.DataFrame):
+        """
+        Übergibt ein eingelesenes Blatt ohne Kopie an die AppLogic und zeigt es an.
+        Das bisher angezeigte Blatt kommt zurück in den Cache, sofern es nicht bearbeitet wurde;
+        bearbeitete DataFrames entsprechen nicht mehr der Datei und werden verworfen.
+        """
+        if self._shown_sheet_key is not None and not self.logic.has_unsaved_changes():
+            self._cache_sheet(self._shown_sheet_key, self.logic.df)
+        self._shown_sheet_key = key
+        self.logic.load_new_sheet(df)
+        self._update_column_models()
+        self._update_table_view()
+        self._fit_column_widths()
+
     def _handle_save(self, show_message=True):
-        """Speichert das aktuelle Tabellenblatt in die Excel-Datei."""
+        """
+        Speichert das aktuelle Tabellenblatt im Hintergrund in die Excel-Datei.
+        Gibt False zurück, wenn nichts gespeichert werden kann, sonst True (Speichern gestartet oder unnötig).
+        """
         if self.logic.df.empty or not self.current_sheet:
             if show_message:
                 self.show_warning("Nichts zu speichern", "Es sind keine Daten zum Speichern geladen.")
             return False
 
-        try:
-            excel_handler.save_sheet(self.excel_path, self.current_sheet, self.logic.df)
-            self.logic.push_state() # Der gespeicherte Zustand ist der neue "saubere" Zustand
+        if not self.logic.has_unsaved_changes():
+            # Unverändertes Blatt nicht erneut schreiben.
             if show_message:
-                self.show_status(f"Blatt '{self.current_sheet}' erfolgreich gespeichert.", 3000)
+                self.show_status("Keine ungespeicherten Änderungen.", 3000)
             return True
-        except (IOError, Exception) as e:
-            if show_message:
-                self.show_error("Fehler beim Speichern", str(e))
-            return False
+
+        # Die Lese-Arbeitsmappe hält die Datei offen und wird vor dem Schreiben geschlossen.
+        self._close_workbook()
+        self._sheet_cache.clear()
+        self._shown_sheet_key = None
+
+        saver = ExcelSaver(self.excel_path, self.current_sheet, self.logic.df)
+        saver.signals.saved.connect(lambda path, sheet: self._on_sheet_saved(sheet, show_message))
+        saver.signals.failed.connect(lambda message: self._on_sheet_save_failed(message, show_message))
+        self.show_status(f"Speichere Blatt '{self.current_sheet}'...")
+        self._start_io_task(saver)
+        return True
+
+    def _on_sheet_saved(self, sheet_name: str, show_message: bool):
+        """Wird nach erfolgreichem Speichern im Hintergrund aufgerufen."""
+        self._finish_io_task()
+        # Die Bedienelemente waren gesperrt, der gespeicherte Stand ist also der aktuelle.
+        self.logic.mark_saved()
+        if show_message:
+            self.show_status(f"Blatt '{sheet_name}' erfolgreich gespeichert.", 3000)
+
+    def _on_sheet_save_failed(self, message: str, show_message: bool):
+        """Meldet einen Fehler beim Speichern im Hintergrund."""
+        self._finish_io_task()
+        if show_message:
+            self.show_error("Fehler beim Speichern", message)
             
+
+    def _close_workbook(self):
+        """Schließt die geöffnete Arbeitsmappe; sie wird beim nächsten Blattwechsel neu geöffnet."""
+        if self._wb is not None:
+            excel_handler.close_workbook(self._wb)
+            self._wb = None
+
     def clear_all_data(self):
         """Setzt die Anwendung in einen sauberen, leeren Zustand zurück."""
+        self._shown_sheet_key = None
         self.logic.load_new_sheet(pd.DataFrame())
         self.sheet_names = []
         self.current_sheet = ""
+        self._update_column_models()
         self._update_tab_bar()
         self._update_table_view()
 
     # --- UI Aktualisierungen ---
     def _update_table_view(self):
-        """Aktualisiert die QTableWidget mit den Daten aus der AppLogic."""
-        self.table.blockSignals(True) # Verhindert, dass cellChanged während der Aktualisierung ausgelöst wird
-        
-        df_view = self.logic.get_current_view()
-        self.table.setRowCount(df_view.shape[0])
-        self.table.setColumnCount(df_view.shape[1])
-        self.table.setHorizontalHeaderLabels(df_view.columns.astype(str))
-
-        for r_idx, (orig_index, row) in enumerate(df_view.iterrows()):
-            for c_idx, value in enumerate(row):
-                item_text = "" if pd.isna(value) else str(value)
-                item = QTableWidgetItem(item_text)
-                self.table.setItem(r_idx, c_idx, item)
-
-        self.table.resizeColumnsToContents()
-        self.table.blockSignals(False)
-        self._handle_search(self.search_input.text()) # Suche erneut anwenden, um Highlights zu aktualisieren
+        """Übergibt die aktuelle Ansicht der AppLogic an das Tabellenmodell."""
+        # Modell-Reset und neue Hervorhebungen werden zu einem einzigen Neuzeichnen zusammengefasst.
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.model.set_view(self.logic.get_current_view())
+            self._reset_search_cache()
+            self._handle_search(self.search_input.text()) # Suche erneut anwenden, um Highlights zu aktualisieren
+        finally:
+            self.table.setUpdatesEnabled(True)
         
+    def _fit_column_widths(self, sample_rows: int = 50):
+        """
+        Passt die Spaltenbreiten an Überschrift und die ersten `sample_rows` Zeilen an.
+        resizeColumnsToContents würde dafür jede Zelle der Tabelle in Text umwandeln.
+        """
+        df = self.logic.df
+        fm = self.table.fontMetrics()
+        sample = df.iloc[:sample_rows]
+        for c, column in enumerate(df.columns):
+            texts = [str(column)] + ["" if pd.isna(v) else str(v) for v in sample.iloc[:, c]]
+            self.table.setColumnWidth(c, max(fm.horizontalAdvance(t) for t in texts) + 20)
+
+    def _update_column_models(self):
+        """Befüllt die Spaltenlisten des Filterdialogs mit den Spalten des geladenen Blatts."""
+        columns = self.logic.df.columns.astype(str).tolist()
+        self._filter_column_model.setStringList([ALLE_SPALTEN] + columns)
+        self._sort_column_model.setStringList([KEINE_SPALTE] + columns)
+
     def _update_tab_bar(self):
         """Aktualisiert die Tab-Leiste mit den aktuellen Tabellenblattnamen."""
         self.tab_bar.blockSignals(True)
@@ -236,21 +380,8 @@ class MainWindow(QMainWindow):
         
     def _highlight_search_results(self):
         """Hebt Suchergebnisse in der Tabelle hervor."""
-        # Zuerst alle alten Hervorhebungen entfernen
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                if item:
-                    item.setBackground(QColor("white"))
-        
-        if not self.search_hits:
-            return
-            
-        # Neue Hervorhebungen setzen
-        for r, c in self.search_hits:
-            item = self.table.item(r, c)
-            if item:
-                item.setBackground(QBrush(QColor("yellow")))
+        # Das Modell liefert den Hintergrund der Treffer; alte Hervorhebungen entfallen dabei.
+        self.model.set_hits(self.search_hits)
 
     # --- Event-Handler für Benutzeraktionen ---
     def _handle_sheet_change(self, index: int):
@@ -265,33 +396,47 @@ class MainWindow(QMainWindow):
         # HINWEIS: Logik zum Löschen von Blättern aus Excel ist komplex und hier
         # zur Vereinfachung weggelassen. Dies schließt nur den Tab in der UI.
         sheet_name = self.tab_bar.tabText(index)
-        reply = QMessageBox.question(self, "Tab schließen",
-                                     f"Möchten Sie den Tab für '{sheet_name}' wirklich schließen?\n(Dies löscht das Blatt nicht aus der Excel-Datei)",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            self.tab_bar.removeTab(index)
+        # Nicht-blockierende Rückfrage: Die Ereignisschleife läuft weiter, während der Dialog offen ist.
+        box = QMessageBox(QMessageBox.Icon.Question, "Tab schließen",
+                          f"Möchten Sie den Tab für '{sheet_name}' wirklich schließen?\n(Dies löscht das Blatt nicht aus der Excel-Datei)",
+                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self)
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        box.finished.connect(lambda result: self._close_sheet_tab(sheet_name, result))
+        box.open()
+
+    def _close_sheet_tab(self, sheet_name: str, result: int):
+        """Schließt den Tab nach der Bestätigung."""
+        if result != QMessageBox.StandardButton.Yes:
+            return
+        # Der Index kann sich inzwischen verschoben haben (z.B. durch andere geschlossene Tabs).
+        for index in range(self.tab_bar.count()):
+            if self.tab_bar.tabText(index) == sheet_name:
+                self.tab_bar.removeTab(index)
+                return
 
     def _handle_cell_changed(self, row: int, column: int):
-        """Wird aufgerufen, wenn der Benutzer den Inhalt einer Zelle ändert."""
-        new_text = self.table.item(row, column).text()
-        
-        # Den originalen Index aus dem View-DataFrame holen
-        try:
-            original_index = self.logic.get_current_view().index[row]
-            column_name = self.logic.df.columns[column]
-            
-            # Logik-Schicht vor der Änderung benachrichtigen, um Undo zu ermöglichen
-            self.logic.push_state()
-            
-            # Die Änderung im Haupt-DataFrame durchführen
-            self.logic.df.loc[original_index, column_name] = new_text
-            
-            self.show_status("Zelle geändert. Ungespeicherte Änderungen.", 2000)
-        except IndexError:
-            # Passiert, wenn in eine neue, leere Zeile getippt wird.
-            # Diese Logik müsste erweitert werden, um neue Zeilen korrekt zu behandeln.
-            print(f"Warnung: Änderung in Zeile {row} konnte nicht zugeordnet werden.")
-            pass
+        """Wird aufgerufen, nachdem der Benutzer den Inhalt einer Zelle geändert hat."""
+        # Das Modell hat die Änderung bereits über die AppLogic (inkl. Undo) übernommen.
+        if self.logic.affects_view(column):
+            # Filter oder Sortierung hängen an der Spalte: Die Ansicht wird nach dem Schließen
+            # des Editors neu aufgebaut, damit Tabelle und Suche dieselbe Zeilenfolge haben.
+            QTimer.singleShot(0, self._update_table_view)
+        else:
+            self._reset_search_cache()
+        self.show_status("Zelle geändert. Ungespeicherte Änderungen.", 2000)
+
+    def _handle_clear_cells(self):
+        """Leert alle markierten Zellen als einen einzigen Undo-Schritt."""
+        indexes = self.table.selectionModel().selectedIndexes()
+        if not indexes:
+            return
+        rows = [self.model.df_row(index.row()) for index in indexes]
+        cols = [index.column() for index in indexes]
+        changed = self.logic.clear_cells(rows, cols)
+        if changed == []:
+            return  # Alle markierten Zellen waren bereits leer.
+        self._refresh_changed_cells(changed)
+        self.show_status("Zellen geleert. Ungespeicherte Änderungen.", 2000)
 
     def _handle_open_new_file(self):
         """Öffnet einen Dateidialog, um eine neue Excel-Datei auszuwählen."""
@@ -314,28 +459,56 @@ class MainWindow(QMainWindow):
             self.show_status("Suche zurückgesetzt.", 1500)
             return
             
-        df_view = self.logic.get_current_view()
-        for r_idx, (orig_index, row) in enumerate(df_view.iterrows()):
-            for c_idx, value in enumerate(row):
-                if text in str(value).lower():
-                    self.search_hits.append((r_idx, c_idx))
+        if text in self._search_cache:
+            # Bereits gesuchter Begriff, z.B. nach dem Löschen eines Zeichens.
+            self._search_cache.move_to_end(text)
+            self.search_hits = self._search_cache[text]
+        else:
+            # Spaltenweise Suche über die Caches der AppLogic. Wird der Begriff nur verlängert,
+            # prüft sie je Spalte nur die bisherigen Treffer; nach einer Änderung wird nur die
+            # geänderte Spalte neu aufbereitet.
+            self.search_hits = self.logic.find_in_view(text)
+
+        self._search_cache[text] = self.search_hits
+        if len(self._search_cache) > 16:
+            self._search_cache.popitem(last=False)
         
         self.show_status(f"{len(self.search_hits)} Treffer gefunden.", 2000)
         self._highlight_search_results()
         
+    def _reset_search_cache(self):
+        """Verwirft die zwischengespeicherten Suchtreffer, nachdem sich Ansicht oder Daten geändert haben."""
+        self._search_cache.clear()
+
     def _handle_undo(self):
-        if self.logic.undo():
-            self._update_table_view()
-            self.show_status("Aktion rückgängig gemacht.", 2000)
-        else:
+        if not self.logic.undo_stack:
             self.show_status("Keine weiteren Aktionen zum Rückgängigmachen.", 2000)
+            return
+        self._refresh_changed_cells(self.logic.undo())
+        self.show_status("Aktion rückgängig gemacht.", 2000)
 
     def _handle_redo(self):
-        if self.logic.redo():
-            self._update_table_view()
-            self.show_status("Aktion wiederhergestellt.", 2000)
-        else:
+        if not self.logic.redo_stack:
             self.show_status("Keine weiteren Aktionen zum Wiederherstellen.", 2000)
+            return
+        self._refresh_changed_cells(self.logic.redo())
+        self.show_status("Aktion wiederhergestellt.", 2000)
+
+    def _refresh_changed_cells(self, changed):
+        """
+        Aktualisiert nach Undo/Redo nur die geänderten Zellen. Ist `changed` None, haben sich
+        die Zeilen der Ansicht verschoben und die Tabelle wird komplett neu angezeigt.
+        """
+        if changed is None:
+            self._update_table_view()
+            return
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.model.refresh_cells(changed)
+            self._reset_search_cache()
+            self._handle_search(self.search_input.text())
+        finally:
+            self.table.setUpdatesEnabled(True)
 
     # --- Dialog-Handler ---
     def _show_recent_files_dialog(self):
@@ -344,7 +517,7 @@ class MainWindow(QMainWindow):
         if dialog.exec():
             # Aktualisierte Liste der letzten Dateien speichern
             self.settings['recent_excel_files'] = dialog.recent_files
-            self._save_settings()
+            self._settings_dirty = True
 
             if dialog.open_new_file_requested:
                 self._handle_open_new_file()
@@ -357,22 +530,33 @@ class MainWindow(QMainWindow):
             self.show_warning("Keine Daten", "Es sind keine Daten zum Filtern oder Sortieren geladen.")
             return
 
-        dialog = FilterDialog(self.logic.df.columns.tolist(), self)
+        previous_state = self.logic.get_filter_state()
+        dialog = FilterDialog(self._filter_column_model, self._sort_column_model, self)
+        dialog.filter_changed.connect(lambda: self._apply_filter_dialog_values(dialog))
         if dialog.exec():
-            self.logic.apply_filters_and_sort(
-                dialog.filter_column_name,
-                dialog.filter_text,
-                dialog.sort_column_name,
-                dialog.sort_type
-            )
-            self._update_table_view()
+            self._apply_filter_dialog_values(dialog)
             self.show_status("Filter und Sortierung angewendet.", 2000)
+        elif self.logic.get_filter_state() != previous_state:
+            # Abbrechen verwirft die Live-Vorschau und stellt die vorherigen Kriterien wieder her.
+            self.logic.apply_filters_and_sort(*(value or "" for value in previous_state))
+            self._update_table_view()
+
+    def _apply_filter_dialog_values(self, dialog: FilterDialog):
+        """Wendet die im Filterdialog gewählten Kriterien an und aktualisiert die Tabelle."""
+        self.logic.apply_filters_and_sort(
+            dialog.filter_column_name,
+            dialog.filter_text,
+            dialog.sort_column_name,
+            dialog.sort_type
+        )
+        self._update_table_view()
 
     def _show_settings_dialog(self):
         """Zeigt den Einstellungsdialog."""
         dialog = SettingsDialog(self.settings, self)
         if dialog.exec():
             self.settings = dialog.settings
+            self._settings_dirty = True
             self._save_settings()
             self.show_status("Einstellungen gespeichert.", 2000)
 
@@ -380,6 +564,7 @@ class MainWindow(QMainWindow):
         """Zeigt das Kontextmenü für die Tabelle."""
         menu = QMenu()
         menu.addAction("Kopieren", lambda: kopiere_markierte_zellen(self.table))
+        menu.addAction(self._clear_cells_action)
         # Hier können weitere Aktionen wie "Einfügen", "Zeile löschen" etc. hinzugefügt werden.
         menu.exec(self.table.mapToGlobal(pos))
         
@@ -387,17 +572,34 @@ class MainWindow(QMainWindow):
     def _load_settings(self) -> dict:
         """Lädt Einstellungen aus einer JSON-Datei."""
         try:
+            if orjson is not None:
+                with open("app_settings.json", 'rb') as f:
+                    return orjson.loads(f.read())
             with open("app_settings.json", 'r', encoding='utf-8') as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {'recent_excel_files': [], 'auto_save': False}
 
     def _save_settings(self):
-        """Speichert die aktuellen Einstellungen in eine JSON-Datei."""
-        try:
+        """Speichert die aktuellen Einstellungen in eine JSON-Datei, sofern sie sich geändert haben."""
+        if self.settings.get('last_excel_path') != self.excel_path:
             self.settings['last_excel_path'] = self.excel_path
-            with open("app_settings.json", 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
+            self._settings_dirty = True
+        if not self._settings_dirty:
+            return
+
+        try:
+            if orjson is not None:
+                data = orjson.dumps(self.settings, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.settings, indent=4).encode('utf-8')
+            # Erst in eine temporäre Datei schreiben und dann ersetzen, damit ein Absturz
+            # während des Schreibens die vorhandenen Einstellungen nicht beschädigt.
+            tmp_path = "app_settings.json.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, "app_settings.json")
+            self._settings_dirty = False
         except Exception as e:
             self.show_warning("Speicherfehler", f"Einstellungen konnten nicht gespeichert werden: {e}")
 
@@ -408,7 +610,8 @@ class MainWindow(QMainWindow):
             recent.remove(file_path)
         recent.insert(0, file_path)
         self.settings['recent_excel_files'] = recent[:10] # Auf 10 begrenzen
-        self._save_settings()
+        # Wird gesammelt beim Beenden geschrieben statt bei jedem Öffnen einer Datei.
+        self._settings_dirty = True
         
     # --- Hilfsfunktionen für Nachrichten ---
     def show_status(self, message, timeout=0):
@@ -428,7 +631,10 @@ class MainWindow(QMainWindow):
         
         dialog = ConfirmExitDialog(self)
         if dialog.exec():
+            # Ein laufendes Speichern wird noch abgeschlossen, bevor das Fenster geschlossen wird.
+            QThreadPool.globalInstance().waitForDone()
             self._save_settings()
+            self._close_workbook()
             event.accept()
         else:
             event.ignore()
@@ -65,7 +65,23 @@ def _create_dummy_logo_if_not_exists():
             print(f"Unbekannter Fehler beim Erstellen des Dummy-Logos: {e}")
 
 
-# Führe die Hilfsfunktionen aus, wenn das Modul geladen wird.
-_create_dummy_excel_if_not_exists()
-_create_dummy_logo_if_not_exists()
+def ensure_assets():
+    """
+    Legt fehlende Dummy-Dateien (Excel-Datei und Logo) an. Wird einmal beim Programmstart
+    aufgerufen statt beim Import des Moduls.
+    """
+    _create_dummy_excel_if_not_exists()
+    _create_dummy_logo_if_not_exists()
 
+
+# --- Zwischengespeicherte Ressourcen ---
+
+_LOGO_ICON = None
+
+def get_logo_icon():
+    """Gibt das Anwendungslogo als QIcon zurück; die Datei wird nur beim ersten Aufruf gelesen."""
+    global _LOGO_ICON
+    if _LOGO_ICON is None:
+        from PyQt6.QtGui import QIcon
+        _LOGO_ICON = QIcon(LOGO_PFAD)
+    return _LOGO_ICON
@@ -0,0 +1,182 @@
+# table_model.py
+# Enthält das Tabellenmodell, über das die QTableView die Daten der AppLogic anzeigt.
+# Die Zellen werden erst beim Zeichnen abgefragt, es werden keine Qt-Objekte pro Zelle erzeugt.
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+
+class PandasTableModel(QAbstractTableModel):
+    """
+    Stellt die aktuelle (gefilterte und sortierte) Ansicht der AppLogic als Qt-Tabellenmodell dar.
+    Die Werte werden direkt aus dem Haupt-DataFrame gelesen; das Modell merkt sich nur, welche
+    Zeile des Haupt-DataFrames in welcher Zeile der Ansicht steht.
+    """
+    # Wird nach einer erfolgreichen Bearbeitung einer Zelle durch den Benutzer ausgelöst (Zeile, Spalte).
+    cell_edited = pyqtSignal(int, int)
+
+    # Die einzigen Rollen, die das Modell beantwortet; alle anderen werden sofort abgewiesen.
+    _DATA_ROLES = frozenset((Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.BackgroundRole))
+
+    # Anzahl der Zeilen, die der View auf einmal bekannt gemacht werden (siehe fetchMore).
+    FETCH_BATCH = 500
+
+    def __init__(self, logic, parent=None):
+        super().__init__(parent)
+        self._logic = logic
+        self._columns = pd.Index([])
+        self._row_count = 0
+        # Anzahl der Zeilen, die der View bereits gemeldet wurden; wächst beim Scrollen in Blöcken.
+        self._loaded_rows = 0
+        # Zeilenpositionen im Haupt-DataFrame je angezeigter Zeile; None, wenn die Ansicht das df selbst ist.
+        self._rows = None
+        # Hervorgehobene Suchtreffer als (Zeile, Spalte) der Ansicht.
+        self._hits_set = set()
+        self._highlight = QBrush(QColor("yellow"))
+        # Werte des Haupt-DataFrames als NumPy-Array je Spaltenposition, beim ersten Zugriff erstellt.
+        # Gelten für die Version des df in _cols_version; bei einer anderen Version werden alle verworfen.
+        self._cols = {}
+        self._cols_version = None
+
+    def set_view(self, df_view: pd.DataFrame):
+        """Übernimmt eine neue Ansicht der Daten und setzt das Modell zurück."""
+        self.beginResetModel()
+        self._columns = df_view.columns
+        self._row_count = df_view.shape[0]
+        self._loaded_rows = min(self._row_count, self.FETCH_BATCH)
+        if df_view is self._logic.df:
+            self._rows = None
+        else:
+            self._rows = self._logic.df.index.get_indexer(df_view.index)
+        self._hits_set = set()
+        self.endResetModel()
+
+    def set_hits(self, hits):
+        """
+        Setzt die hervorzuhebenden Suchtreffer und aktualisiert deren Hintergrund.
+        Es wird nur das Rechteck um alte und neue Treffer neu gezeichnet, nicht die ganze Tabelle.
+        """
+        new_hits = set(hits)
+        changed = self._hits_set ^ new_hits
+        self._hits_set = new_hits
+        self._emit_changed(changed, [Qt.ItemDataRole.BackgroundRole])
+
+    def refresh_cells(self, cells):
+        """Meldet der View geänderte Werte für die Zellen (Zeile, Spalte) der Ansicht, ohne das Modell zurückzusetzen."""
+        self._emit_changed(cells, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    def _emit_changed(self, cells, roles):
+        """
+        Löst dataChanged über das Rechteck um die Zellen aus. Zeilen, die noch nicht geladen
+        wurden, werden übersprungen; sie werden beim Nachladen ohnehin neu abgefragt.
+        """
+        cells = [(r, c) for r, c in cells if r < self._loaded_rows]
+        if not cells:
+            return
+        rows = [r for r, _ in cells]
+        cols = [c for _, c in cells]
+        self.dataChanged.emit(self.index(min(rows), min(cols)), self.index(max(rows), max(cols)), roles)
+
+    def _column_values(self, col: int):
+        """Gibt die Werte einer Spalte des Haupt-DataFrames als NumPy-Array zurück (zwischengespeichert)."""
+        version = self._logic.get_version()
+        if version != self._cols_version:
+            self._cols = {}
+            self._cols_version = version
+        values = self._cols.get(col)
+        if values is None:
+            series = self._logic.df.iloc[:, col]
+            values = series.to_numpy()
+            if values.dtype.kind in "mM":
+                # datetime64/timedelta64 würden als '2021-01-02T00:00:00.000000' angezeigt;
+                # als Timestamp/Timedelta entspricht der Text dem der Zelle in pandas.
+                values = series.astype(object).to_numpy()
+            self._cols[col] = values
+        return values
+
+    def _refresh_column(self, col: int, previous_version: int):
+        """
+        Verwirft nach einer eigenen Bearbeitung nur das Array der geschriebenen Spalte.
+        Die übrigen bleiben gültig, sofern sie zur Version vor der Bearbeitung gehörten.
+        """
+        if self._cols_version != previous_version:
+            return
+        self._cols.pop(col, None)
+        self._cols_version = self._logic.get_version()
+
+    def range_texts(self, top: int, bottom: int, left: int, right: int) -> list:
+        """
+        Gibt die Anzeigetexte eines rechteckigen Bereichs der Ansicht als Liste von Zeilen zurück.
+        Die Werte werden spaltenweise direkt aus den NumPy-Arrays gelesen, ohne QModelIndex je Zelle.
+        """
+        rows = np.arange(top, bottom + 1) if self._rows is None else self._rows[top:bottom + 1]
+        columns = []
+        for col in range(left, right + 1):
+            values = self._column_values(col)[rows]
+            columns.append(["" if pd.isna(v) else str(v) for v in values])
+        return [list(row) for row in zip(*columns)]
+
+    def df_row(self, row: int) -> int:
+        """Gibt die Zeilenposition im Haupt-DataFrame für eine Zeile der Ansicht zurück."""
+        return row if self._rows is None else int(self._rows[row])
+
+    # --- Schnittstelle von QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < self._row_count
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Meldet der View den nächsten Block von Zeilen, sobald sie ans Ende der geladenen Zeilen scrollt."""
+        if parent.isValid():
+            return
+        end = min(self._loaded_rows + self.FETCH_BATCH, self._row_count)
+        if end <= self._loaded_rows:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, end - 1)
+        self._loaded_rows = end
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # Die View fragt beim Zeichnen jede sichtbare Zelle für viele Rollen ab (Schrift, Ausrichtung, ...).
+        if role not in self._DATA_ROLES or not index.isValid():
+            return None
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            # Reiner Array-Zugriff, keine pandas-Indizierung beim Zeichnen.
+            value = self._column_values(index.column())[self.df_row(index.row())]
+            return "" if pd.isna(value) else str(value)
+
+        if role == Qt.ItemDataRole.BackgroundRole and (index.row(), index.column()) in self._hits_set:
+            return self._highlight
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return str(self._columns[section])
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Schreibt eine Benutzereingabe über die AppLogic (mit Undo) in das Haupt-DataFrame."""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+
+        previous_version = self._logic.get_version()
+        self._logic.set_cell(self.df_row(index.row()), index.column(), value)
+        self._refresh_column(index.column(), previous_version)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.cell_edited.emit(index.row(), index.column())
+        return True
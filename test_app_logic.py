@@ -0,0 +1,249 @@
+# test_app_logic.py
+# Tests für die Kernlogik (AppLogic) ohne Benutzeroberfläche. Ausführen mit `python -m pytest`.
+
+import math
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+import app_logic
+from app_logic import AppLogic
+
+
+def _assert_floats(actual, expected):
+    """Vergleicht zwei Float-Folgen, wobei NaN an derselben Stelle als gleich gilt."""
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if math.isnan(e):
+            assert math.isnan(a)
+        else:
+            assert a == pytest.approx(e)
+
+
+# --- Numerische Umwandlung von Textspalten ---
+
+@pytest.mark.parametrize("dtype", ["string[pyarrow]", "arrow_string", "object"])
+@pytest.mark.parametrize("values, expected", [
+    # Ungerade und gerade Zeilenanzahl: Beide Fälle sind bei falsch gelesenen 32-Bit-Offsets aufgefallen.
+    (["10", " 2.5 ", "abc", None, "-3e2"], [10.0, 2.5, float("nan"), float("nan"), -300.0]),
+    (["1", "x", "0.25", None], [1.0, float("nan"), 0.25, float("nan")]),
+])
+def test_coerce_numeric_parses_string_columns(dtype, values, expected):
+    pa = pytest.importorskip("pyarrow")
+    if dtype == "arrow_string":
+        dtype = pd.ArrowDtype(pa.string())
+    series = pd.Series(values, dtype=dtype)
+    _assert_floats(app_logic._coerce_numeric(series), expected)
+
+
+def test_coerce_numeric_respects_slice_offset():
+    pytest.importorskip("pyarrow")
+    series = pd.Series(["7", "8", "x", "9.5"], dtype="string[pyarrow]").iloc[1:]
+    _assert_floats(app_logic._coerce_numeric(series), [8.0, float("nan"), 9.5])
+
+
+def test_coerce_numeric_mixed_object_column():
+    series = pd.Series([5, "3", "abc", 1.5], dtype=object)
+    _assert_floats(app_logic._coerce_numeric(series), [5.0, 3.0, float("nan"), 1.5])
+
+
+def test_numeric_sort_on_arrow_string_column():
+    pytest.importorskip("pyarrow")
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Preis": pd.Series(["20", "3", "100"], dtype="string[pyarrow]")}))
+    logic.apply_filters_and_sort(sort_col="Preis", sort_type="num_asc")
+    assert logic.get_current_view()["Preis"].tolist() == ["3", "20", "100"]
+
+
+# --- Filter ---
+
+def _filtered(df, filter_col, text):
+    logic = AppLogic()
+    logic.load_new_sheet(df)
+    logic.apply_filters_and_sort(filter_col=filter_col, filter_text=text)
+    return logic.get_current_view()
+
+
+def test_lowered_column_maps_missing_values_to_empty_string():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["Banane", np.nan, None, "MAUS"]}))
+    assert logic._lowered_column("Name").tolist() == ["banane", "", "", "maus"]
+
+
+def test_filter_does_not_match_missing_cells():
+    df = pd.DataFrame({"Name": ["Banane", np.nan, "Maus", np.nan]})
+    assert _filtered(df, "Name", "na")["Name"].tolist() == ["Banane"]
+
+
+def test_expand_hits_ignores_missing_value_code():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["ma", None, "ma", "x"]}))
+    # Codes wie von pd.factorize für eine Spalte mit fehlendem Wert (-1).
+    logic._value_index["Name"] = (pd.Series(["x", "ma"]), np.array([1, -1, 1, 0]))
+    hits = np.array([False, True])
+    assert logic._expand_hits("Name", hits).tolist() == [True, False, True, False]
+
+
+def test_filter_on_repeated_values_skips_blank_rows():
+    df = pd.DataFrame({"Name": ["Max", "Max", "Erika", None, "Erika", None, "Max", "Max"]})
+    assert _filtered(df, "Name", "ma")["Name"].tolist() == ["Max"] * 4
+
+
+# --- Sortierung ---
+
+@pytest.mark.parametrize("sort_type, expected", [
+    ("az", ["apfel", "Birne", "zitrone", None, None]),
+    ("za", ["zitrone", "Birne", "apfel", None, None]),
+])
+def test_text_sort_with_blank_cells(sort_type, expected):
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["Birne", np.nan, "zitrone", "apfel", None]}))
+    logic.apply_filters_and_sort(sort_col="Name", sort_type=sort_type)
+    result = [None if pd.isna(v) else v for v in logic.get_current_view()["Name"]]
+    assert result == expected
+
+
+def test_all_columns_filter_with_blank_arrow_cells():
+    pa = pytest.importorskip("pyarrow")
+    df = pd.DataFrame({
+        "Gegenstand": pd.Series(["Laptop", None, "Maus", "Tastatur"], dtype=pd.ArrowDtype(pa.string())),
+        "Mitarbeiter": pd.Series([None, "Max", "Erika", None], dtype=pd.ArrowDtype(pa.string())),
+        "Preis": [1200.5, np.nan, 25.0, 75.99],
+    })
+    view = _filtered(df, None, "ma")
+    assert view.index.tolist() == [1, 2]
+
+
+def test_match_substring_treats_nulls_as_no_match():
+    pa = pytest.importorskip("pyarrow")
+    mask = app_logic._match_substring(pa.array(["abc", None, "xbz"]), "b")
+    assert mask.dtype == bool
+    assert mask.tolist() == [True, False, True]
+
+
+def test_haystack_contains_with_missing_values():
+    pytest.importorskip("stringzilla")
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["Anna", np.nan, "Hanna", "Bob"]}))
+    values = pd.Series(["anna", np.nan, "hanna", "bob"], dtype=object)
+    assert logic._haystack_contains("Name", values, "nna").tolist() == [True, False, True, False]
+
+
+def test_single_column_filter_on_unique_column_with_blank():
+    df = pd.DataFrame({"Name": ["Anna", None, "Hanna", "Bob", "Jonna"]})
+    assert _filtered(df, "Name", "nna")["Name"].tolist() == ["Anna", "Hanna", "Jonna"]
+
+
+def test_reset_filters_and_sort_restores_full_view():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["b", "a", "c"]}))
+    logic.apply_filters_and_sort(filter_col="Name", filter_text="a", sort_col="Name", sort_type="za")
+    logic.reset_filters_and_sort()
+    assert logic.get_current_view()["Name"].tolist() == ["b", "a", "c"]
+
+
+# --- Suche ---
+
+def test_find_in_view_uses_view_rows_and_skips_blanks():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["Max", None, "Anna", "Mara"], "Ort": ["Mainz", "Bonn", None, "Ulm"]}))
+    logic.apply_filters_and_sort(sort_col="Name", sort_type="za")
+    # Ansicht: Max, Mara, Anna, <leer> ("max" > "mara", da 'x' > 'r')
+    assert logic.find_in_view("ma") == [(0, 0), (0, 1), (1, 0)]
+    assert logic.find_in_view("nan") == []
+
+
+def test_find_in_view_sees_edits_without_full_rebuild():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["Max", "Anna"], "Ort": ["Mainz", "Bonn"]}))
+    assert logic.find_in_view("bonn") == [(1, 1)]
+    lowered_name = logic._lowered_column("Name")
+    logic.set_cell(0, 1, "Bonn")
+    assert logic.find_in_view("bonn") == [(0, 1), (1, 1)]
+    # Die nicht geänderte Spalte wird aus dem Cache weiterverwendet.
+    assert logic._lowered_column("Name") is lowered_name
+
+
+# --- Undo/Redo ---
+
+def test_undo_redo_returns_changed_view_cell():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["b", "a", "c"], "Ort": ["x", "y", "z"]}))
+    logic.apply_filters_and_sort(sort_col="Name", sort_type="az")
+    logic.set_cell(0, 1, "neu")
+    assert logic.undo() == [(1, 1)]  # Zeile 0 steht in der sortierten Ansicht an Position 1.
+    assert logic.df.iat[0, 1] == "x"
+    assert logic.redo() == [(1, 1)]
+    assert logic.df.iat[0, 1] == "neu"
+    assert logic.redo() is None
+
+
+def test_undo_of_sorted_column_requests_full_refresh():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["b", "a", "c"]}))
+    logic.apply_filters_and_sort(sort_col="Name", sort_type="az")
+    logic.set_cell(0, 0, "z")
+    assert logic.undo() is None
+    assert logic.get_current_view()["Name"].tolist() == ["a", "b", "c"]
+
+
+def test_unchanged_value_adds_no_undo_step():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["a", None]}))
+    logic.set_cell(0, 0, "a")
+    logic.set_cell(1, 0, np.nan)
+    assert logic.undo_stack == []
+    assert not logic.has_unsaved_changes()
+
+
+
+def test_clear_cells_is_one_undo_step_per_selection():
+    pa = pytest.importorskip("pyarrow")
+    df = pd.DataFrame({
+        "Name": pd.Series(["Laptop", "Maus", None, "Tastatur"], dtype=pd.ArrowDtype(pa.string())),
+        "Anzahl": [3, 1, 4, 2],
+        "Preis": [1200.5, 25.0, 9.0, 75.99],
+    })
+    logic = AppLogic()
+    logic.load_new_sheet(df)
+    logic.apply_filters_and_sort(sort_col="Preis", sort_type="num_desc")
+    # Ansicht: Laptop (0), Tastatur (3), Maus (1), <leer> (2)
+    changed = logic.clear_cells([0, 3, 2, 0, 3], [0, 0, 0, 1, 1])
+    assert sorted(changed) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert len(logic.undo_stack) == 1
+    assert logic.df["Name"].isna().tolist() == [True, False, True, True]
+    assert logic.df["Anzahl"].isna().tolist() == [True, False, False, True]
+
+    assert sorted(logic.undo()) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert logic.df["Name"].tolist()[:2] == ["Laptop", "Maus"] and logic.df["Name"].iloc[3] == "Tastatur"
+    assert logic.df["Anzahl"].tolist() == [3, 1, 4, 2]
+    assert logic.redo() is not None
+    assert logic.df["Anzahl"].isna().tolist() == [True, False, False, True]
+
+
+def test_clear_cells_on_sorted_column_or_blank_cells():
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Name": ["b", None, "a"]}))
+    assert logic.clear_cells([1], [0]) == []
+    assert logic.undo_stack == []
+    logic.apply_filters_and_sort(sort_col="Name", sort_type="az")
+    assert logic.clear_cells([2], [0]) is None
+    assert logic.get_current_view()["Name"].tolist()[0] == "b"
+
+
+@pytest.mark.parametrize("values, dtype_kind", [
+    (pd.to_datetime(["2021-01-02", "2021-03-04"]), "M"),
+    ([1.5, 2.0], "f"),
+    ([1, 2], "O"),
+    ([True, False], "O"),
+])
+def test_clear_cells_keeps_column_type_where_possible(values, dtype_kind):
+    logic = AppLogic()
+    logic.load_new_sheet(pd.DataFrame({"Wert": values}))
+    logic.clear_cells([1], [0])
+    assert logic.df["Wert"].dtype.kind == dtype_kind
+    assert logic.df["Wert"].isna().tolist() == [False, True]
+    logic.undo()
+    assert logic.df["Wert"].tolist() == list(values)
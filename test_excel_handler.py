@@ -0,0 +1,58 @@
+# test_excel_handler.py
+# Tests für das Laden und Speichern von Excel-Dateien. Ausführen mit `python -m pytest`.
+
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+import excel_handler
+
+
+def test_mixed_column_keeps_numbers_after_round_trip(tmp_path):
+    path = str(tmp_path / "inventar.xlsx")
+    original = pd.DataFrame({
+        "Gegenstand": ["Laptop", "Maus", None],
+        "Nummer": [5, "A-7", 12],
+        "Preis": [1200.5, 25.0, 75.99],
+    })
+    excel_handler.save_sheet(path, "Inventar", original)
+
+    df = excel_handler.load_sheet(path, "Inventar")
+    # Gemischte Spalten werden nicht in Text umgewandelt.
+    assert df["Nummer"].tolist() == [5, "A-7", 12]
+    assert df["Preis"].tolist() == [1200.5, 25.0, 75.99]
+
+    excel_handler.save_sheet(path, "Inventar", df)
+    again = excel_handler.load_sheet(path, "Inventar")
+    assert again["Nummer"].tolist() == [5, "A-7", 12]
+
+
+def test_pure_text_column_is_arrow_backed():
+    pa = pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"Name": pd.Series(["a", None, "b"], dtype=object), "Zahl": [1, 2, 3]})
+    excel_handler._convert_text_columns_to_arrow(df)
+    assert df["Name"].dtype == pd.ArrowDtype(pa.string())
+    assert df["Name"].isna().tolist() == [False, True, False]
+    assert df["Zahl"].dtype.kind == "i"
+
+
+@pytest.mark.parametrize("error_number", ["EROFS", "EACCES"])
+def test_read_only_file_is_not_reported_as_locked(tmp_path, monkeypatch, error_number):
+    import builtins
+    import errno
+
+    path = tmp_path / "inventar.xlsx"
+    path.write_bytes(b"")
+    real_open = builtins.open
+
+    def read_only_open(file, mode="r", *args, **kwargs):
+        if str(file) == str(path) and "+" in mode:
+            code = getattr(errno, error_number)
+            raise OSError(code, os.strerror(code))
+        return real_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", read_only_open)
+    assert excel_handler.is_excel_file_locked(str(path)) is False
@@ -0,0 +1,31 @@
+# test_table_model.py
+# Tests für das Tabellenmodell der QTableView. Ausführen mit `python -m pytest`.
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("PyQt6.QtWidgets")
+
+from app_logic import AppLogic
+from table_model import PandasTableModel
+
+
+def _model(df):
+    logic = AppLogic()
+    logic.load_new_sheet(df)
+    model = PandasTableModel(logic)
+    model.set_view(logic.get_current_view())
+    return model
+
+
+def test_date_and_duration_cells_render_like_pandas():
+    df = pd.DataFrame({
+        "Datum": pd.to_datetime(["2021-01-02", None]),
+        "Dauer": pd.to_timedelta(["1 days 02:00:00", "3h"]),
+    })
+    model = _model(df)
+    assert model.data(model.index(0, 0)) == str(pd.Timestamp("2021-01-02"))
+    assert model.data(model.index(1, 0)) == ""
+    assert model.data(model.index(0, 1)) == str(pd.Timedelta("1 days 02:00:00"))
+    assert model.range_texts(0, 1, 0, 1) == [["2021-01-02 00:00:00", "1 days 02:00:00"],
+                                             ["", "0 days 03:00:00"]]
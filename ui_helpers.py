@@ -1,31 +1,43 @@
 # ui_helpers.py
 # Enthält kleine, wiederverwendbare Funktionen, die bei UI-Operationen helfen.
 
-from PyQt6.QtWidgets import QApplication, QTableWidget
+from PyQt6.QtWidgets import QApplication, QTableView
 
-def kopiere_markierte_zellen(table_widget: QTableWidget):
+def kopiere_markierte_zellen(table_view: QTableView):
     """
     Kopiert den Inhalt der markierten Zellen als tabulatorgetrennten Text
     in die Zwischenablage, was das Einfügen in andere Tabellenkalkulationen erleichtert.
     """
-    selected_ranges = table_widget.selectedRanges()
-    if not selected_ranges:
+    selection = table_view.selectionModel().selection()
+    if selection.isEmpty():
         return
 
     # Findet die Grenzen der Auswahl, um eine rechteckige Datenstruktur zu erstellen.
-    top = min(r.topRow() for r in selected_ranges)
-    bottom = max(r.bottomRow() for r in selected_ranges)
-    left = min(r.leftColumn() for r in selected_ranges)
-    right = max(r.rightColumn() for r in selected_ranges)
+    top = min(r.top() for r in selection)
+    bottom = max(r.bottom() for r in selection)
+    left = min(r.left() for r in selection)
+    right = max(r.right() for r in selection)
+
+    model = table_view.model()
+    if len(selection) == 1:
+        # Ein einzelnes Rechteck (der Normalfall): Jede Zelle darin ist markiert, die Prüfung
+        # mit selection.contains entfällt. Das Tabellenmodell liefert den Bereich am Stück.
+        if hasattr(model, 'range_texts'):
+            block = model.range_texts(top, bottom, left, right)
+        else:
+            index = model.index
+            block = [[index(r, c).data() or '' for c in range(left, right + 1)] for r in range(top, bottom + 1)]
+        QApplication.clipboard().setText('\n'.join('\t'.join(row) for row in block))
+        return
 
     output_rows = []
     for r in range(top, bottom + 1):
         row_data = []
         for c in range(left, right + 1):
-            item = table_widget.item(r, c)
+            index = model.index(r, c)
             # Nur ausgewählte Zellen hinzufügen, ansonsten leer lassen
-            if item and item.isSelected():
-                row_data.append(item.text())
+            if selection.contains(index):
+                row_data.append(index.data() or '')
             else:
                 row_data.append('')
         output_rows.append('\t'.join(row_data))